@@ -0,0 +1,169 @@
+# the three visualizer engines headless: A* (astar.py), Dijkstra (dijkstra.py) and
+# the consecutive end points variant (astar_variant.py, start -> end -> end2)
+# on seeded random fill maps of growing size and density
+#
+# every case records wall time (best of --repeat), nodes expanded, heap pushes,
+# path cost and peak memory (tracemalloc, measured in a separate untimed run since
+# tracing slows everything down). Results go to JSON / CSV with the commit they
+# were measured on, and --compare prints the change against an earlier JSON file
+#
+# run from the repo root:
+#   python benchmarks/engines.py --json before.json
+#   python benchmarks/engines.py --compare before.json
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pathfinder import astar, dijkstra, route  # noqa: E402
+from pathfinder.generate import random_fill  # noqa: E402
+
+SIZES = (50, 100, 200, 400)
+DENSITIES = (0.1, 0.2, 0.3)
+FIELDS = ("engine", "rows", "density", "seed", "found", "cost", "expanded", "pushes",
+          "seconds", "peak_bytes")
+
+
+def stops(rows):
+    # same corners every time: start top left, end bottom right, end2 top right
+    return (0, 0), (rows - 1, rows - 1), (0, rows - 1)
+
+
+# name -> run(grid, start, end, end2), each what the script of that name searches
+ENGINES = {
+    "astar": lambda grid, start, end, end2: astar(grid, start, end),
+    "dijkstra": lambda grid, start, end, end2: dijkstra(grid, start, end),
+    "variant": lambda grid, start, end, end2: route(grid, [start, end, end2]),
+}
+
+
+def measure(run, grid, points, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        began = time.perf_counter()
+        result = run(grid, *points)
+        best = min(best, time.perf_counter() - began)
+    tracemalloc.start()
+    try:
+        run(grid, *points)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def run_cases(engines, sizes, densities, seeds, repeat):
+    for rows in sizes:
+        for density in densities:
+            for seed in range(seeds):
+                points = stops(rows)
+                grid = random_fill(rows, density=density, seed=seed, keep=points)
+                for name in engines:
+                    result, seconds, peak = measure(ENGINES[name], grid, points, repeat)
+                    yield {
+                        "engine": name,
+                        "rows": rows,
+                        "density": density,
+                        "seed": seed,
+                        "found": result.found,
+                        "cost": result.cost if result else None,
+                        "expanded": result.expanded,
+                        "pushes": result.pushes,
+                        "seconds": seconds,
+                        "peak_bytes": peak,
+                    }
+
+
+def summary(results):
+    # mean over the seeds of every (engine, rows, density)
+    groups = {}
+    for row in results:
+        groups.setdefault((row["engine"], row["rows"], row["density"]), []).append(row)
+    table = {}
+    for key, rows in groups.items():
+        count = len(rows)
+        table[key] = {
+            "found": sum(row["found"] for row in rows),
+            "seeds": count,
+            "expanded": sum(row["expanded"] for row in rows) / count,
+            "pushes": sum(row["pushes"] for row in rows) / count,
+            "seconds": sum(row["seconds"] for row in rows) / count,
+            "peak_bytes": sum(row["peak_bytes"] for row in rows) / count,
+        }
+    return table
+
+
+def print_summary(table, baseline=None):
+    header = "%-9s %6s %7s %7s %10s %10s %10s %10s" % (
+        "engine", "rows", "density", "found", "expanded", "pushes", "ms", "peak KB")
+    if baseline is not None:
+        header += " %9s %9s" % ("ms diff", "exp diff")
+    print(header)
+    for key in sorted(table, key=lambda key: (key[1], key[2], key[0])):
+        stats = table[key]
+        line = "%-9s %6d %7.2f %3d/%-3d %10.0f %10.0f %10.2f %10.1f" % (
+            key[0], key[1], key[2], stats["found"], stats["seeds"], stats["expanded"],
+            stats["pushes"], stats["seconds"] * 1000, stats["peak_bytes"] / 1024)
+        old = baseline.get(key) if baseline is not None else None
+        if old is not None:
+            line += " %+8.1f%% %+8.1f%%" % (
+                (stats["seconds"] / max(old["seconds"], 1e-12) - 1) * 100,
+                (stats["expanded"] / max(old["expanded"], 1) - 1) * 100)
+        print(line)
+
+
+def commit():
+    # the commit the numbers belong to, None outside a git checkout
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="benchmark the A*, Dijkstra and variant engines")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--densities", type=float, nargs="+", default=DENSITIES)
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the best one counts")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--json", help="write every case and the run's details here")
+    parser.add_argument("--csv", help="write every case here, one row each")
+    parser.add_argument("--compare", help="JSON file of an earlier run to print the change against")
+    args = parser.parse_args(argv)
+
+    results = list(run_cases(args.engines, args.sizes, args.densities, args.seeds, args.repeat))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = summary(json.load(file)["results"])
+    print_summary(summary(results), baseline)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({
+                "commit": commit(),
+                "python": platform.python_version(),
+                "machine": platform.platform(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": results,
+            }, file, indent=1)
+    if args.csv:
+        with open(args.csv, "w", newline="") as file:
+            writer = csv.DictWriter(file, FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+
+
+if __name__ == "__main__":
+    main()
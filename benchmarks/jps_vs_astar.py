@@ -0,0 +1,56 @@
+# plain A* vs jump point search on the random mazes the M key makes
+# (every cell a barrier with chance 1/7), same start/end corners as you'd click them
+# run from the repo root: python benchmarks/jps_vs_astar.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pathfinder import astar  # noqa: E402
+from pathfinder.generate import random_fill  # noqa: E402
+from pathfinder.jps import jps  # noqa: E402
+
+
+def k_m_maze(rows, seed, divisor=7):
+    # same as pressing M once in the visualizer, but seeded
+    # a bigger divisor gives a more open map
+    start, end = (0, 0), (rows - 1, rows - 1)
+    grid = random_fill(rows, density=1 / divisor, seed=seed, keep=(start, end))
+    return grid, start, end
+
+
+def timed(engine, grid, start, end):
+    began = time.perf_counter()
+    result = engine(grid, start, end)
+    return result, time.perf_counter() - began
+
+
+def main(sizes=(40, 100, 200, 400), seeds=5, divisor=7):
+    print("1/%d of the cells barriers" % divisor)
+    print("%6s %8s %10s %10s %8s %10s %10s %8s" % (
+        "rows", "cost", "A* exp", "JPS exp", "ratio", "A* ms", "JPS ms", "speedup"))
+    for rows in sizes:
+        totals = [0, 0, 0.0, 0.0]
+        cost = 0
+        for seed in range(seeds):
+            grid, start, end = k_m_maze(rows, seed, divisor)
+            a, a_time = timed(astar, grid, start, end)
+            j, j_time = timed(jps, grid, start, end)
+            if a.cost != j.cost:
+                raise AssertionError("path length differs on seed %d: %r vs %r" % (seed, a.cost, j.cost))
+            cost += a.cost if a else 0
+            totals[0] += a.expanded
+            totals[1] += j.expanded
+            totals[2] += a_time
+            totals[3] += j_time
+        print("%6d %8.1f %10d %10d %7.1fx %10.1f %10.1f %7.1fx" % (
+            rows, cost / seeds, totals[0] // seeds, totals[1] // seeds,
+            totals[0] / max(totals[1], 1), totals[2] * 1000 / seeds, totals[3] * 1000 / seeds,
+            totals[2] / max(totals[3], 1e-9)))
+
+
+if __name__ == "__main__":
+    main()
+    print()
+    main(divisor=50)
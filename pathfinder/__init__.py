@@ -0,0 +1,66 @@
+# headless path finding, no pygame needed
+from .events import CLOSED, OPEN, EventBatcher
+from .grid import Grid
+from .heuristics import COST_SCALE, chebyshev, euclidean, manhattan, octile, zero
+from .neighbours import EIGHT_WAY, EIGHT_WAY_UNIFORM, FOUR_WAY, MOVEMENTS, Movement
+from .search import SearchResult, astar, dijkstra, distances, search
+from .stats import SearchStats
+from .limits import CancelToken, Limits
+from .components import ComponentIndex, ComponentLabels
+from .jps import jps
+from .anytime import ARAStar, AnytimeResult, ara_star, weighted_astar
+from .bidirectional import bidirectional, bidirectional_astar, bidirectional_dijkstra
+from .waypoints import RouteResult, route, solve_legs
+from .tour import TourResult, plan_tour
+from .batch import SharedGrid, batch, shared_pool
+from .cache import PathCache
+from .dstar import DStarLite
+from .hpa import HierarchicalGrid, HPAResult
+
+__all__ = [
+    "Grid",
+    "OPEN",
+    "CLOSED",
+    "EventBatcher",
+    "COST_SCALE",
+    "chebyshev",
+    "euclidean",
+    "manhattan",
+    "octile",
+    "zero",
+    "Movement",
+    "MOVEMENTS",
+    "FOUR_WAY",
+    "EIGHT_WAY",
+    "EIGHT_WAY_UNIFORM",
+    "SearchResult",
+    "astar",
+    "dijkstra",
+    "search",
+    "distances",
+    "SearchStats",
+    "Limits",
+    "CancelToken",
+    "ComponentLabels",
+    "ComponentIndex",
+    "jps",
+    "weighted_astar",
+    "ARAStar",
+    "AnytimeResult",
+    "ara_star",
+    "bidirectional",
+    "bidirectional_astar",
+    "bidirectional_dijkstra",
+    "RouteResult",
+    "route",
+    "solve_legs",
+    "TourResult",
+    "plan_tour",
+    "SharedGrid",
+    "batch",
+    "shared_pool",
+    "PathCache",
+    "DStarLite",
+    "HierarchicalGrid",
+    "HPAResult",
+]
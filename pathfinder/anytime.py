@@ -0,0 +1,262 @@
+# trading path quality for speed
+#
+# weighted_astar: A* with the heuristic multiplied by weight. It dives towards the
+# end and usually expands far fewer cells, and the path costs at most weight times
+# the optimal one (for an admissible heuristic, which the movement defaults are)
+#
+# ARAStar: anytime repairing A* (Likhachev et al.). The first path comes from a
+# search with a big weight, then the weight is lowered step by step down to 1 and
+# every round repairs the previous one instead of starting over: g values, the
+# open list and the cells that got cheaper after being expanded (incons) carry
+# over. improve() runs until a time / expansion budget is used up and returns the
+# best path so far with the bound that has been proven for it, the next improve()
+# carries on from there
+#
+#     planner = ARAStar(grid, start, end)
+#     result = planner.improve(time_limit=0.01)   # something quickly
+#     result = planner.improve(time_limit=0.05)   # better, maybe optimal (result.bound == 1)
+import time
+from heapq import heapify, heappop, heappush
+
+from .events import CLOSED, OPEN
+from .heuristics import COST_SCALE, scaled
+from .neighbours import EIGHT_WAY, expander, path_cost
+from .limits import NO_PATH, OUT_OF_EXPANSIONS, OUT_OF_TIME
+from .search import SearchResult, partial_path, reconstruct_path, search
+
+# weighted_astar's default: paths at most 1.5x the optimal length
+WEIGHT = 1.5
+# ARA* starts at ARA_WEIGHT and takes STEP off after every round
+ARA_WEIGHT = 3.0
+STEP = 0.5
+
+
+def weighted_astar(grid, start, end, visit=None, weight=WEIGHT, movement=EIGHT_WAY, heuristic=None, stats=None):
+    base = movement.heuristic if heuristic is None else heuristic
+    if weight == 1:
+        return search(grid, start, end, base, movement, visit, stats)
+
+    def inflated(a, b):
+        # rounding down keeps it <= weight * h, so the bound still holds
+        return int(base(a, b) * weight)
+
+    return search(grid, start, end, inflated, movement, visit, stats)
+
+
+class AnytimeResult(SearchResult):
+    def __init__(self, found, path, cost, expanded, bound, solutions, pushes=0, stale=0, status=None,
+                 partial=None):
+        super().__init__(found, path, cost, expanded, pushes, stale, status, partial)
+        # proven: cost <= bound * optimal cost, 1.0 means the path is optimal
+        # (inf while there is no path yet, 1.0 as well once there is provably none)
+        self.bound = bound
+        # every improvement so far as (cost, bound, seconds, expanded), the first one
+        # is the first path found, seconds / expanded are totals since the planner started
+        self.solutions = solutions
+
+    def __repr__(self):
+        return "AnytimeResult(found=%r, cost=%r, bound=%r, expanded=%r, solutions=%d, len(path)=%d)" % (
+            self.found, self.cost, self.bound, self.expanded, len(self.solutions), len(self.path))
+
+
+class ARAStar:
+    def __init__(self, grid, start, end, weight=ARA_WEIGHT, step=STEP, movement=EIGHT_WAY, heuristic=None):
+        if step <= 0:
+            # the weight would never get down to 1 and improve() never finish
+            raise ValueError("step has to be above 0, got %r" % step)
+        self.grid = grid
+        self.start = start
+        self.end = end
+        self.step = step
+        self.movement = movement
+        self.heuristic = scaled(movement.heuristic if heuristic is None else heuristic, grid.min_cost)
+        self.neighbours = expander(grid, movement)
+        self.source = grid.cell_id(start)
+        self.target = grid.cell_id(end)
+        self.weight = max(weight, 1.0)
+        self.g = {self.source: 0}
+        self.came_from = {}
+        self.h = {}
+        self.closed = set()
+        self.incons = set()
+        self.pri_queue = []
+        self.open_entry = {}
+        self.count = 0
+        self.expanded = 0
+        self.pushes = 0
+        self.stale = 0
+        self.elapsed = 0.0  # seconds spent in improve() so far
+        self.solutions = []
+        self.best = None  # (cost, path) of the best path so far
+        self.bound = float("inf")
+        self.round_done = False  # the current weight's round has finished
+        self.done = False  # optimal path found, or no path at all
+        self.stopped = None  # OUT_OF_EXPANSIONS / OUT_OF_TIME if the last improve() ran out
+        self.push(self.source)
+
+    def heuristic_of(self, cell):
+        h = self.h.get(cell)
+        if h is None:
+            h = self.h[cell] = self.heuristic(self.grid.pos(cell), self.end)
+        return h
+
+    def push(self, cell):
+        h = self.heuristic_of(cell)
+        self.count += 1
+        self.pushes += 1
+        heappush(self.pri_queue, (self.g[cell] + self.weight * h, h, self.count, cell))
+        self.open_entry[cell] = self.count
+
+    def top(self):
+        # smallest live entry, stale ones are dropped on the way
+        pri_queue = self.pri_queue
+        while pri_queue and self.open_entry.get(pri_queue[0][3]) != pri_queue[0][2]:
+            heappop(pri_queue)
+            self.stale += 1
+        return pri_queue[0] if pri_queue else None
+
+    def next_round(self):
+        # lower the weight, put the incons cells back on the open list and
+        # re-key everything with the new weight; closed starts over
+        self.weight = max(1.0, self.weight - self.step)
+        cells = set(self.open_entry) | self.incons
+        self.incons = set()
+        self.closed = set()
+        g = self.g
+        heuristic_of = self.heuristic_of
+        self.pri_queue = []
+        self.open_entry = {}
+        for cell in cells:
+            h = heuristic_of(cell)
+            self.count += 1
+            self.pri_queue.append((g[cell] + self.weight * h, h, self.count, cell))
+            self.open_entry[cell] = self.count
+        heapify(self.pri_queue)
+        self.round_done = False
+
+    def improve_path(self, deadline, limit, visit):
+        # one round at the current weight, None once it's finished, else the status
+        # of the budget that ran out first (the round then carries on in the next call)
+        neighbours = self.neighbours
+        g = self.g
+        came_from = self.came_from
+        closed = self.closed
+        incons = self.incons
+        pos = self.grid.pos
+        inf = float("inf")
+        source, target = self.source, self.target
+        while True:
+            top = self.top()
+            if top is None or g.get(target, inf) <= top[0]:
+                return None
+            if limit is not None and self.expanded >= limit:
+                return OUT_OF_EXPANSIONS
+            if deadline is not None and time.perf_counter() >= deadline:
+                return OUT_OF_TIME
+            heappop(self.pri_queue)
+            current = top[3]
+            del self.open_entry[current]
+            closed.add(current)
+            self.expanded += 1
+            current_g = g[current]
+            for neighbour, cost in neighbours(current):
+                temp_g_score = current_g + cost
+                if temp_g_score < g.get(neighbour, inf):
+                    g[neighbour] = temp_g_score
+                    came_from[neighbour] = current
+                    if neighbour in closed:
+                        # expanded already this round, it waits for the next one
+                        incons.add(neighbour)
+                    else:
+                        self.push(neighbour)
+                        if visit:
+                            visit(pos(neighbour), OPEN)
+            if visit and current != source:
+                visit(pos(current), CLOSED)
+
+    def path_cost(self, path):
+        # g(end) can be stale by the end of a round, the path itself is exact
+        return path_cost(self.grid, self.movement, path)
+
+    def current_path(self):
+        # (cost, path) the parent links give for the end right now, None if not reached
+        if self.target not in self.g:
+            return None
+        path = [self.grid.pos(cell) for cell in reconstruct_path(self.came_from, self.target)]
+        return self.path_cost(path), path
+
+    def finish_round(self):
+        g = self.g
+        found = self.current_path()
+        if found is not None:
+            # a round's path can cost more than one kept earlier (a bigger weight got
+            # lucky), only a cheaper one replaces it: results never get worse
+            improved = self.best is None or found[0] < self.best[0]
+            if improved:
+                self.best = found
+            cost = self.best[0]
+            # the optimal cost is at least the smallest g + h still waiting, and the kept
+            # path is no dearer than this round's, which is within weight of optimal
+            lower = min((g[cell] + self.heuristic_of(cell) for cell in set(self.open_entry) | self.incons),
+                        default=cost)
+            bound = max(min(self.weight, cost / lower) if lower else 1.0, 1.0)
+            if improved or bound < self.bound:
+                self.bound = min(self.bound, bound)
+                self.solutions.append((cost / COST_SCALE, self.bound, self.elapsed, self.expanded))
+        if self.weight == 1.0 or not (self.open_entry or self.incons):
+            # optimal now, or the end can't be reached at all
+            self.done = True
+            self.bound = 1.0
+        self.round_done = True
+
+    def take_partial(self):
+        # out of budget halfway through a round: a cheaper path found so far is still
+        # worth having, the last round's bound holds for it too
+        found = self.current_path()
+        if found is not None and self.best is not None and found[0] < self.best[0]:
+            self.best = found
+            self.solutions.append((found[0] / COST_SCALE, self.bound, self.elapsed, self.expanded))
+
+    def improve(self, time_limit=None, max_expansions=None, visit=None):
+        # keeps improving until the path is optimal or the budget is spent:
+        # time_limit seconds and / or max_expansions cells expanded in this call
+        began = time.perf_counter()
+        deadline = None if time_limit is None else began + time_limit
+        limit = None if max_expansions is None else self.expanded + max_expansions
+        self.stopped = None
+        try:
+            while not self.done:
+                if self.round_done:
+                    self.next_round()
+                self.stopped = self.improve_path(deadline, limit, visit)
+                now = time.perf_counter()
+                self.elapsed += now - began
+                began = now
+                if self.stopped is not None:
+                    self.take_partial()
+                    break
+                self.finish_round()
+        finally:
+            self.elapsed += time.perf_counter() - began
+        return self.result()
+
+    def result(self):
+        if self.best is None:
+            if self.done:
+                return AnytimeResult(False, [], float("inf"), self.expanded, 1.0, list(self.solutions),
+                                     self.pushes, self.stale, NO_PATH)
+            # out of budget before any path: not a "no path", and like a search cut short
+            # by its limits it comes with the partial path to the closest cell reached
+            partial = partial_path(self.grid, self.end, self.movement, self.g, self.came_from)
+            return AnytimeResult(False, [], float("inf"), self.expanded, float("inf"), list(self.solutions),
+                                 self.pushes, self.stale, self.stopped or OUT_OF_EXPANSIONS, partial)
+        cost, path = self.best
+        return AnytimeResult(True, list(path), cost / COST_SCALE, self.expanded, self.bound,
+                             list(self.solutions), self.pushes, self.stale)
+
+
+def ara_star(grid, start, end, visit=None, weight=ARA_WEIGHT, step=STEP, time_limit=None,
+             max_expansions=None, movement=EIGHT_WAY, heuristic=None):
+    # one shot ARA*: the best path it gets to within the budget (optimal without one)
+    planner = ARAStar(grid, start, end, weight, step, movement, heuristic)
+    return planner.improve(time_limit, max_expansions, visit)
@@ -0,0 +1,108 @@
+# many start/end queries against one map, spread over a process pool
+# the grid is put in shared memory once; workers attach to it instead of
+# getting a pickled copy, so a big map costs the same for 1 or 10000 queries.
+# The engine options go to each worker once as well, not with every chunk
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+from .grid import Grid
+from .search import astar
+
+# queries are sent to the workers in chunks of this many
+CHUNKSIZE = 64
+
+
+class SharedGrid:
+    # a read-only copy of grid.cells in a named shared memory block, followed by
+    # grid.costs when the grid has terrain costs
+    def __init__(self, grid):
+        self.rows = grid.rows
+        self.cols = grid.cols
+        size = len(grid.cells)
+        self.costs = grid.costs is not None
+        self.min_cost = grid.min_cost
+        self.weighted = grid.weighted
+        self.memory = shared_memory.SharedMemory(create=True, size=max(2 * size if self.costs else size, 1))
+        self.memory.buf[:size] = grid.cells
+        if self.costs:
+            self.memory.buf[size:2 * size] = grid.costs
+        self.name = self.memory.name
+
+    def close(self):
+        self.memory.close()
+        self.memory.unlink()
+
+
+# set in every worker by _attach
+_worker_grid = None
+_worker_memory = None
+_worker_options = {}
+
+
+def _attach(name, rows, cols, costs, min_cost, weighted, options):
+    global _worker_grid, _worker_memory, _worker_options
+    # pool workers share the parent's resource tracker, so attaching doesn't
+    # register a second owner and only the parent's close() unlinks the block
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    # a Grid straight over the shared buffer, nothing is copied
+    size = rows * cols
+    _worker_grid = Grid(rows, cols, _worker_memory.buf[:size])
+    if costs:
+        # the layer as it is (set_costs would copy it), with what the parent knows about it
+        _worker_grid.costs = _worker_memory.buf[size:2 * size]
+        _worker_grid.min_cost = min_cost
+        _worker_grid.weighted = weighted
+    # pickled once per worker, options holding big things (components=ComponentLabels
+    # and its grid, say) would otherwise be sent along with every chunk
+    _worker_options = options
+
+
+@contextmanager
+def shared_pool(grid, workers, options=None):
+    # process pool whose workers can all see grid as _worker_grid, and the engine
+    # options (a dict) as _worker_options
+    shared = SharedGrid(grid)
+    try:
+        with ProcessPoolExecutor(workers, initializer=_attach,
+                                 initargs=(shared.name, shared.rows, shared.cols, shared.costs,
+                                           shared.min_cost, shared.weighted, options or {})) as pool:
+            yield pool
+    finally:
+        shared.close()
+
+
+def run_query(engine, a, b):
+    # one query inside a shared_pool worker
+    return engine(_worker_grid, a, b, None, **_worker_options)
+
+
+def _run_chunk(engine, chunk):
+    return [(i, engine(_worker_grid, a, b, None, **_worker_options)) for i, (a, b) in chunk]
+
+
+def batch(grid, queries, engine=astar, workers=None, ordered=True, chunksize=CHUNKSIZE, **options):
+    # yields (index, SearchResult) for every (start, end) in queries, in order,
+    # or as soon as each chunk finishes with ordered=False
+    # options (movement=..., heuristic=...) go to the engine
+    queries = list(queries)
+    if not workers or workers == 1:
+        for i, (a, b) in enumerate(queries):
+            yield i, engine(grid, a, b, None, **options)
+        return
+
+    indexed = list(enumerate(queries))
+    chunks = [indexed[i:i + chunksize] for i in range(0, len(indexed), chunksize)]
+    with shared_pool(grid, workers, options) as pool:
+        futures = [pool.submit(_run_chunk, engine, chunk) for chunk in chunks]
+        try:
+            if ordered:
+                for future in futures:
+                    yield from future.result()
+            else:
+                for future in as_completed(futures):
+                    yield from future.result()
+        finally:
+            # the caller may stop reading early, don't run what nobody will see
+            for future in futures:
+                future.cancel()
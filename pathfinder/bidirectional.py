@@ -0,0 +1,124 @@
+# bidirectional A* / dijkstra: one search from the start and one from the end,
+# on the same grid model and costs as search.py
+#
+# both directions use the average potential p(v) = (h(v, end) - h(start, v)) / 2
+# (backward uses -p), which keeps them consistent with each other, so the search can
+# stop as soon as top forward key + top backward key >= best meeting cost.
+# keys are kept doubled so everything stays in integers
+from heapq import heappop, heappush
+
+from .events import CLOSED, OPEN
+from .heuristics import COST_SCALE, scaled, zero
+from .neighbours import EIGHT_WAY, FOUR_WAY, expander
+from .search import SearchResult
+
+
+class _Side:
+    # open list and labels for one direction
+    def __init__(self, root, goal, other_goal, heuristic, pos):
+        self.goal = goal  # position this side is heading to
+        self.other_goal = other_goal
+        self.heuristic = heuristic
+        self.pos = pos
+        self.g_score = {root: 0}
+        self.came_from = {}
+        self.pri_queue = []
+        self.open_entry = {}
+        self.count = 0
+        self.other = None
+        self.push(root, 0)
+
+    def push(self, cell, g):
+        p = self.pos(cell)
+        h_score = self.heuristic(p, self.goal)
+        key = 2 * g + h_score - self.heuristic(p, self.other_goal)
+        self.count += 1
+        heappush(self.pri_queue, (key, h_score, self.count, cell))
+        self.open_entry[cell] = self.count
+
+    def top(self):
+        # smallest live key, throws stale entries away on the way
+        pri_queue = self.pri_queue
+        stale = 0
+        while pri_queue and self.open_entry.get(pri_queue[0][3]) != pri_queue[0][2]:
+            heappop(pri_queue)
+            stale += 1
+        return (pri_queue[0][0] if pri_queue else None), stale
+
+    def chain(self, cell):
+        # cells from cell back to this side's root
+        path = [cell]
+        while cell in self.came_from:
+            cell = self.came_from[cell]
+            path.append(cell)
+        return path
+
+
+def bidirectional(grid, start, end, heuristic=None, movement=EIGHT_WAY, visit=None):
+    if heuristic is None:
+        heuristic = movement.heuristic
+    heuristic = scaled(heuristic, grid.min_cost)
+    neighbours = expander(grid, movement)
+    pos = grid.pos
+    source = grid.cell_id(start)
+    target = grid.cell_id(end)
+    inf = float("inf")
+
+    forward = _Side(source, end, start, heuristic, pos)
+    backward = _Side(target, start, end, heuristic, pos)
+    forward.other = backward
+    backward.other = forward
+
+    best = inf  # cost of the best start -> end path seen so far
+    meet = source if source == target else None
+    if meet is not None:
+        best = 0
+    expanded = 0
+    stale = 0
+
+    while True:
+        top_f, dropped_f = forward.top()
+        top_b, dropped_b = backward.top()
+        stale += dropped_f + dropped_b
+        if top_f is None or top_b is None or top_f + top_b >= 2 * best:
+            break
+
+        # grow the smaller frontier
+        side = forward if len(forward.pri_queue) <= len(backward.pri_queue) else backward
+        other = side.other
+        current = heappop(side.pri_queue)[3]
+        del side.open_entry[current]
+        expanded += 1
+
+        current_g = side.g_score[current]
+        for neighbour, cost in neighbours(current):
+            temp_g_score = current_g + cost
+            other_g = other.g_score.get(neighbour)
+            if other_g is not None and temp_g_score + other_g < best:
+                best = temp_g_score + other_g
+                # this always improves neighbour on this side too (a cheaper label
+                # would already have given a cheaper meeting), so came_from follows
+                meet = neighbour
+            if temp_g_score < side.g_score.get(neighbour, inf):
+                side.came_from[neighbour] = current
+                side.g_score[neighbour] = temp_g_score
+                side.push(neighbour, temp_g_score)
+                if visit:
+                    visit(pos(neighbour), OPEN)
+
+        if visit and current != source and current != target:
+            visit(pos(current), CLOSED)
+
+    pushes = forward.count + backward.count
+    if meet is None:
+        return SearchResult(False, [], inf, expanded, pushes, stale)
+    path = forward.chain(meet)[::-1] + backward.chain(meet)[1:]
+    return SearchResult(True, [pos(cell) for cell in path], best / COST_SCALE, expanded, pushes, stale)
+
+
+def bidirectional_astar(grid, start, end, visit=None, movement=EIGHT_WAY, heuristic=None):
+    return bidirectional(grid, start, end, heuristic, movement, visit)
+
+
+def bidirectional_dijkstra(grid, start, end, visit=None, movement=FOUR_WAY):
+    return bidirectional(grid, start, end, zero, movement, visit)
@@ -0,0 +1,216 @@
+# LRU cache of search results for one grid, kept valid across barrier and cost edits
+#
+# an edit only drops the results it can actually change:
+#   - a new barrier only makes moves more expensive, so a cached path stays the best
+#     one unless the barrier lands on its corridor (its cells, plus the corner cells a
+#     diagonal step squeezes past)
+#   - a removed barrier can only matter to a search that looked at a cell next to it,
+#     so results whose explored region (bounding box of every cell the engine reported,
+#     grown by one) doesn't reach it stay valid
+# near repeats are served too: a query whose start and end both lie, in that order,
+# on a cached path gets that stretch of it (a piece of a shortest path is a shortest path)
+#
+# terrain cost edits drop the results whose explored region they touch, the same way
+# as a removed barrier. Searches scale their heuristic by grid.min_cost though, so
+# when that goes down every result is dropped: cells they never looked at may have
+# become cheap enough to matter
+import sys
+from collections import OrderedDict
+
+from .heuristics import COST_SCALE
+from .jps import jps
+from .limits import FOUND, NO_PATH
+from .search import SearchResult, astar
+
+# a bit over 1 MB of paths by default
+MAX_BYTES = 1 << 20
+
+# engines that look at cells they never report through visit (jps scans whole lines),
+# their explored region is taken to be the whole grid
+UNREPORTED = {jps}
+
+# only these are answers worth keeping, see limits.py
+COMPLETE = (FOUND, NO_PATH)
+
+
+class _Entry:
+    __slots__ = ("key", "result", "region", "corridor", "nbytes")
+
+    def __init__(self, key, result, region, corridor):
+        self.key = key
+        self.result = result
+        self.region = region  # (top, left, bottom, right), already grown by one
+        self.corridor = corridor  # cell ids
+        self.nbytes = (sys.getsizeof(result.path) + sum(sys.getsizeof(p) for p in result.path)
+                       + sys.getsizeof(corridor) + 64 * len(corridor))
+
+
+def _weights(grid, path):
+    # (straight, diagonal): the sums of cost here + cost there over the path's straight
+    # and diagonal steps, a step costs its length times that / 2 (grid.py)
+    costs, cols = grid.costs, grid.cols
+    straight = diagonal = 0
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        weight = 2 if costs is None else costs[r1 * cols + c1] + costs[r2 * cols + c2]
+        if r1 != r2 and c1 != c2:
+            diagonal += weight
+        else:
+            straight += weight
+    return straight, diagonal
+
+
+def _piece_cost(grid, result, first, last):
+    # cost of path[first..last], the diagonal step length is worked out from the whole
+    # path so it doesn't matter which movement model found it
+    path = result.path
+    straight, diagonal = _weights(grid, path[first:last + 1])
+    cost = straight * COST_SCALE
+    if diagonal:
+        total = round(result.cost * COST_SCALE)
+        all_straight, all_diagonal = _weights(grid, path)
+        cost += diagonal * (2 * total - all_straight * COST_SCALE) // all_diagonal
+    return cost / 2 / COST_SCALE
+
+
+class PathCache:
+    def __init__(self, grid, max_bytes=MAX_BYTES):
+        self.grid = grid
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> _Entry, least recently used first
+        self.nbytes = 0
+        # cell id -> keys of the entries whose corridor has that cell
+        self.by_cell = {}
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self.min_cost = grid.min_cost
+        grid.subscribe(self.edited)
+        grid.subscribe_costs(self.costs_edited)
+
+    def close(self):
+        self.grid.unsubscribe(self.edited)
+        self.grid.unsubscribe_costs(self.costs_edited)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, start, end, engine=astar, visit=None, **options):
+        # same as engine(grid, start, end, visit, **options), from the cache when possible
+        # options need to be hashable (movement models and heuristic functions are)
+        tag = (engine, tuple(sorted(options.items())))
+        key = (start, end, tag)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry.result
+        result = self.stretch(start, end, tag)
+        if result is not None:
+            self.partial_hits += 1
+            return result
+
+        self.misses += 1
+        bounds = [min(start[0], end[0]), min(start[1], end[1]), max(start[0], end[0]), max(start[1], end[1])]
+
+        def track(pos, state):
+            row, col = pos
+            if row < bounds[0]:
+                bounds[0] = row
+            elif row > bounds[2]:
+                bounds[2] = row
+            if col < bounds[1]:
+                bounds[1] = col
+            elif col > bounds[3]:
+                bounds[3] = col
+            if visit:
+                visit(pos, state)
+
+        result = engine(self.grid, start, end, track, **options)
+        if result.status not in COMPLETE:
+            # cut short by limits, or turned down by component labels without looking
+            # at the map: nothing here says which edits would change the answer
+            return result
+        if engine in UNREPORTED:
+            region = (0, 0, self.grid.rows, self.grid.cols)
+        else:
+            region = (bounds[0] - 1, bounds[1] - 1, bounds[2] + 1, bounds[3] + 1)
+        self.add(key, result, region)
+        return result
+
+    def stretch(self, start, end, tag):
+        # piece of a cached path that goes from start to end, if there is one
+        for key in self.by_cell.get(self.grid.cell_id(start), ()):
+            if key[2] != tag:
+                continue
+            result = self.entries[key].result
+            path = result.path
+            try:
+                first = path.index(start)  # may just be a corner cell of the corridor
+                last = path.index(end, first)
+            except ValueError:
+                continue
+            self.entries.move_to_end(key)
+            piece = path[first:last + 1]
+            return SearchResult(True, piece, _piece_cost(self.grid, result, first, last), 0)
+        return None
+
+    def add(self, key, result, region):
+        cols = self.grid.cols
+        corridor = set()
+        for row, col in result.path:
+            corridor.add(row * cols + col)
+        for (r1, c1), (r2, c2) in zip(result.path, result.path[1:]):
+            if r1 != r2 and c1 != c2:
+                corridor.add(r1 * cols + c2)
+                corridor.add(r2 * cols + c1)
+        entry = _Entry(key, result, region, corridor)
+        if entry.nbytes > self.max_bytes:
+            return
+        self.entries[key] = entry
+        self.nbytes += entry.nbytes
+        for cell in corridor:
+            self.by_cell.setdefault(cell, set()).add(key)
+        while self.nbytes > self.max_bytes:
+            self.drop(next(iter(self.entries)))
+
+    def drop(self, key):
+        entry = self.entries.pop(key)
+        self.nbytes -= entry.nbytes
+        for cell in entry.corridor:
+            keys = self.by_cell[cell]
+            keys.discard(key)
+            if not keys:
+                del self.by_cell[cell]
+
+    def edited(self, pos, barrier):
+        # grid listener
+        if pos is None:
+            stale = list(self.entries)
+        elif barrier:
+            stale = list(self.by_cell.get(self.grid.cell_id(pos), ()))
+        else:
+            row, col = pos
+            stale = [key for key, entry in self.entries.items()
+                     if entry.region[0] <= row <= entry.region[2] and entry.region[1] <= col <= entry.region[3]]
+        for key in stale:
+            self.drop(key)
+        self.invalidated += len(stale)
+
+    def costs_edited(self, box):
+        # grid cost listener
+        if box is None or self.grid.min_cost < self.min_cost:
+            stale = list(self.entries)
+        else:
+            top, left, bottom, right = box
+            stale = [key for key, entry in self.entries.items()
+                     if entry.region[0] <= bottom and top <= entry.region[2]
+                     and entry.region[1] <= right and left <= entry.region[3]]
+        self.min_cost = self.grid.min_cost
+        for key in stale:
+            self.drop(key)
+        self.invalidated += len(stale)
+
+    def clear(self):
+        for key in list(self.entries):
+            self.drop(key)
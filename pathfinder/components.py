@@ -0,0 +1,272 @@
+# connected component labels: every walkable cell gets the number of the region it
+# is in, so "can start reach end at all" is two lookups instead of a search that
+# floods the whole region before it gives up. Pass components= to search / astar /
+# dijkstra and a query between different regions returns UNREACHABLE straight away
+#
+# EIGHT_WAY without corner cutting connects exactly what FOUR_WAY does (a diagonal
+# needs both cells beside it free), only corner cutting diagonals join more, so
+# labels are built for one of the two: diagonal=False (4 connected) or True
+#
+# ComponentLabels are built for grid.version at the time, after an edit they are out
+# of date and connected() answers None (don't know), searches then just search.
+# ComponentIndex keeps itself up to date through the grid's listeners instead
+from array import array
+from collections import deque
+import re
+
+_RUNS = re.compile(b"\x00+")
+
+# cells a ComponentIndex floods from each side of a new barrier to find out whether
+# it split a region, before it gives up and relabels everything
+SPLIT_BUDGET = 2048
+
+
+class ComponentLabels:
+    def __init__(self, grid, diagonal=False):
+        self.grid = grid
+        self.diagonal = diagonal
+        self.build()
+
+    @classmethod
+    def for_movement(cls, grid, movement):
+        return cls(grid, movement_cuts_corners(movement))
+
+    def build(self):
+        # scanline labelling: find the runs of free cells a row at a time, union
+        # every run with the runs of the row above it touches, then paint each run
+        # with its root. Works per run, not per cell
+        grid = self.grid
+        rows, cols, cells = grid.rows, grid.cols, bytes(grid.cells)
+        reach = 1 if self.diagonal else 0
+        parent = []
+        starts, ends = [], []  # every run, as cell ids, run id = index
+        above = 0  # first run of the row above
+        finditer = _RUNS.finditer
+        for row in range(rows):
+            offset = row * cols
+            first = len(parent)
+            j = above
+            for match in finditer(cells, offset, offset + cols):
+                start, end = match.span()
+                root = len(parent)
+                parent.append(root)
+                starts.append(start)
+                ends.append(end)
+                # runs above that overlap [start - reach, end + reach), in their row's ids
+                low, high = start - cols - reach, end - cols + reach
+                while j < first and ends[j] <= low:
+                    j += 1
+                k = j
+                while k < first and starts[k] < high:
+                    other = k
+                    while parent[other] != other:
+                        parent[other] = other = parent[parent[other]]
+                    if other != root:
+                        parent[root] = other
+                        root = other
+                    k += 1
+            above = first
+
+        labels = array("I", bytes(4 * rows * cols))  # 0 = barrier
+        roots = {}
+        for run in range(len(parent)):
+            root = run
+            while parent[root] != root:
+                parent[root] = root = parent[parent[root]]
+            label = roots.get(root)
+            if label is None:
+                label = roots[root] = len(roots) + 1
+            start = starts[run]
+            labels[start:ends[run]] = array("I", [label]) * (ends[run] - start)
+        self.labels = labels
+        self.count = len(roots)
+        self.version = grid.version
+
+    def fresh(self):
+        # do the labels describe the grid as it is now
+        return self.grid.version == self.version
+
+    def label(self, pos):
+        # 0 for a barrier
+        return self.labels[self.grid.cell_id(pos)]
+
+    def connected(self, a, b):
+        # True / False, or None when the grid changed since the labels were built
+        if not self.fresh():
+            return None
+        label = self.label(a)
+        return label != 0 and label == self.label(b)
+
+    def rejects(self, start, end, movement):
+        # True only when these labels prove end can't be reached under movement:
+        # both free, in different regions (4 connected labels say nothing about
+        # corner cutting moves, and a search from or to a barrier is left alone)
+        if not self.fresh():
+            return False
+        if not self.diagonal and movement_cuts_corners(movement):
+            return False
+        a, b = self.label(start), self.label(end)
+        return a != 0 and b != 0 and a != b
+
+
+# the 8 cells around one, in order going round
+RING = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+
+class ComponentIndex(ComponentLabels):
+    # labels that follow the grid's edits as they happen:
+    # - a barrier removed: the cell joins the regions around it, and when it touches
+    #   several they are merged with a union-find over the labels, nothing is relabelled
+    # - a barrier added: if the free cells around it can still reach each other going
+    #   round it, no region can have split and nothing else changes. Otherwise small
+    #   floods from each side (split()) find out, and only when they can't tell are
+    #   the labels rebuilt (once, at the next query)
+    # so connected() stays two lookups plus a near constant find
+    def __init__(self, grid, diagonal=False):
+        self.rebuilds = 0
+        super().__init__(grid, diagonal)
+        grid.subscribe(self.edited)
+
+    def close(self):
+        self.grid.unsubscribe(self.edited)
+
+    def build(self):
+        super().build()
+        # alias[label]: the label it was merged into, a root points at itself
+        self.alias = list(range(self.count + 1))
+        self.dirty = False
+        self.rebuilds += 1
+
+    def fresh(self):
+        if self.dirty:
+            self.build()
+        return True
+
+    def find(self, label):
+        alias = self.alias
+        while alias[label] != label:
+            alias[label] = label = alias[alias[label]]
+        return label
+
+    def label(self, pos):
+        # labels of merged regions may differ, roots don't
+        self.fresh()
+        return self.find(self.labels[self.grid.cell_id(pos)])
+
+    def around(self, row, col, moves):
+        grid = self.grid
+        rows, cols, cells = grid.rows, grid.cols, grid.cells
+        for dr, dc in moves:
+            r, c = row + dr, col + dc
+            if 0 <= r < rows and 0 <= c < cols and not cells[r * cols + c]:
+                yield r * cols + c
+
+    def ring_groups(self, row, col):
+        # one free neighbour of (row, col) per separate group they form if they
+        # may only go round it through the other cells of the ring
+        grid = self.grid
+        free = [grid.in_bounds((row + dr, col + dc)) and not grid.is_barrier((row + dr, col + dc))
+                for dr, dc in RING]
+        group = list(range(8))
+
+        def find(i):
+            while group[i] != i:
+                i = group[i]
+            return i
+
+        for i in range(8):
+            if free[i] and free[(i + 1) % 8]:
+                group[find(i)] = find((i + 1) % 8)
+        neighbours = range(0, 8, 2)
+        if self.diagonal:
+            # straight neighbours a diagonal step apart touch directly
+            for i in neighbours:
+                if free[i] and free[(i + 2) % 8]:
+                    group[find(i)] = find((i + 2) % 8)
+            neighbours = range(8)
+        first = {}
+        for i in neighbours:
+            if free[i]:
+                first.setdefault(find(i), i)
+        return [grid.cell_id((row + RING[i][0], col + RING[i][1])) for i in first.values()]
+
+    def split(self, starts, moves):
+        # the groups around a new barrier may or may not still meet further away: a
+        # flood of at most SPLIT_BUDGET cells from each settles most cases, groups that
+        # meet are joined, a flood that runs out of cells is a region that broke off and
+        # gets a label of its own. Only if that leaves it open are the labels rebuilt
+        cols = self.grid.cols
+        joined = list(range(len(starts)))
+
+        def find(i):
+            while joined[i] != i:
+                i = joined[i]
+            return i
+
+        where = {cell: i for i, cell in enumerate(starts)}
+        remaining = set(range(len(starts)))
+        for i, start in enumerate(starts):
+            if len({find(j) for j in remaining}) <= 1:
+                return
+            if i not in remaining:
+                continue
+            seen = {start}
+            queue = deque([start])
+            while queue and len(seen) <= SPLIT_BUDGET:
+                cell = queue.popleft()
+                for other in self.around(*divmod(cell, cols), moves):
+                    if other in seen:
+                        continue
+                    seen.add(other)
+                    queue.append(other)
+                    j = where.get(other)
+                    if j is not None and j in remaining:
+                        joined[find(j)] = find(i)
+                        if len({find(k) for k in remaining}) <= 1:
+                            return  # they all still meet
+            if not queue:
+                # that was all of its region: the groups it didn't reach are cut off from it
+                remaining = {j for j in remaining if find(j) != find(i)}
+                if not remaining:
+                    return
+                label = len(self.alias)
+                self.alias.append(label)
+                self.count += 1
+                for cell in seen:
+                    self.labels[cell] = label
+        if len({find(j) for j in remaining}) > 1:
+            self.dirty = True
+
+    def edited(self, pos, barrier):
+        self.version = self.grid.version
+        if self.dirty:
+            return  # rebuilt before the next answer anyway
+        if pos is None:
+            self.dirty = True  # cleared
+            return
+        row, col = pos
+        cell = self.grid.cell_id(pos)
+        moves = RING if self.diagonal else RING[::2]
+        if barrier:
+            self.labels[cell] = 0
+            groups = self.ring_groups(row, col)
+            if not groups:
+                self.count -= 1  # it was a region of its own
+            elif len(groups) > 1:
+                self.split(groups, moves)
+            return
+        roots = {self.find(self.labels[other]) for other in self.around(row, col, moves)}
+        if not roots:
+            label = len(self.alias)
+            self.alias.append(label)
+            self.count += 1
+        else:
+            label = roots.pop()
+            for other in roots:
+                self.alias[other] = label
+            self.count -= len(roots)
+        self.labels[cell] = label
+
+
+def movement_cuts_corners(movement):
+    return movement.cut_corners and any(dr and dc for dr, dc in movement.moves)
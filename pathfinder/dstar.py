@@ -0,0 +1,194 @@
+# incremental replanning with D* Lite: the planner keeps its search state between
+# plan() calls and, after barrier or terrain cost edits, only repairs the cells whose
+# costs changed
+# instead of searching again from scratch
+#
+# it searches backwards from the goal, so the start can also move along the path
+# (move_start) without throwing anything away. With a fixed start it's LPA*
+#
+#     planner = DStarLite(grid, start, goal)
+#     planner.plan()
+#     grid.make_barrier(pos)   # the planner hears about edits made through the grid
+#     planner.plan()           # repairs only what the edit touched
+from heapq import heappop, heappush
+
+from .heuristics import COST_SCALE
+from .neighbours import DIAGONAL, EIGHT_WAY, STRAIGHT, expander
+from .search import SearchResult
+
+
+class DStarLite:
+    def __init__(self, grid, start, goal, movement=EIGHT_WAY, heuristic=None):
+        self.grid = grid
+        self.movement = movement
+        self.heuristic = movement.heuristic if heuristic is None else heuristic
+        self.start = start
+        self.goal = goal
+        self.pending = set()  # cells edited since the last plan()
+        self.expanded = 0  # over the planner's whole life
+        grid.subscribe(self.edited)
+        grid.subscribe_costs(self.costs_edited)
+        self.reset()
+
+    def close(self):
+        self.grid.unsubscribe(self.edited)
+        self.grid.unsubscribe_costs(self.costs_edited)
+
+    def reset(self):
+        # forget everything, the next plan() is a full search
+        self.neighbours = expander(self.grid, self.movement)
+        self.costs = self.grid.costs  # the layer self.neighbours reads, None for none
+        self.goal_cell = self.grid.cell_id(self.goal)
+        self.g = {}
+        self.rhs = {self.goal_cell: 0}
+        self.km = 0
+        self.last = self.start
+        self.pri_queue = []
+        self.open_key = {}
+        self.count = 0
+        self.pending.clear()
+        self.push(self.goal_cell)
+
+    def edited(self, pos, barrier):
+        # grid listener, pos None means the whole grid changed
+        self.pending.add(pos)
+
+    def costs_edited(self, box):
+        # grid cost listener: every step into or out of a cell in box changed, which
+        # is what a barrier edit on each of them would repair. The first costs set on a
+        # grid make a new layer the neighbours don't know about yet, that's a reset
+        if box is None or self.grid.costs is not self.costs:
+            self.pending.add(None)
+            return
+        top, left, bottom, right = box
+        for row in range(max(top, 0), min(bottom, self.grid.rows - 1) + 1):
+            for col in range(max(left, 0), min(right, self.grid.cols - 1) + 1):
+                self.pending.add((row, col))
+
+    def key(self, cell):
+        best = min(self.g.get(cell, float("inf")), self.rhs.get(cell, float("inf")))
+        return best + self.heuristic(self.start, self.grid.pos(cell)) + self.km, best
+
+    def push(self, cell):
+        key = self.key(cell)
+        self.count += 1
+        heappush(self.pri_queue, (key[0], key[1], self.count, cell))
+        self.open_key[cell] = self.count
+
+    def successors(self, cell):
+        # nothing goes in or out of a barrier
+        if self.grid.cells[cell]:
+            return []
+        return self.neighbours(cell)
+
+    def update(self, cell):
+        # recompute rhs from the successors, then requeue if inconsistent
+        if cell != self.goal_cell:
+            g = self.g
+            inf = float("inf")
+            self.rhs[cell] = min((cost + g.get(nxt, inf) for nxt, cost in self.successors(cell)), default=inf)
+        self.requeue(cell)
+
+    def requeue(self, cell):
+        inf = float("inf")
+        if self.g.get(cell, inf) != self.rhs.get(cell, inf):
+            self.push(cell)
+        else:
+            self.open_key.pop(cell, None)
+
+    def top(self):
+        pri_queue = self.pri_queue
+        while pri_queue and self.open_key.get(pri_queue[0][3]) != pri_queue[0][2]:
+            heappop(pri_queue)
+        return pri_queue[0] if pri_queue else None
+
+    def compute(self):
+        inf = float("inf")
+        g, rhs = self.g, self.rhs
+        start = self.grid.cell_id(self.start)
+        goal = self.goal_cell
+        expanded = 0
+        while True:
+            top = self.top()
+            if top is None:
+                break
+            start_key = self.key(start)
+            if (top[0], top[1]) >= start_key and rhs.get(start, inf) <= g.get(start, inf):
+                break
+            heappop(self.pri_queue)
+            cell = top[3]
+            new_key = self.key(cell)
+            if (top[0], top[1]) < new_key:
+                # km moved on since it was queued
+                self.count += 1
+                heappush(self.pri_queue, (new_key[0], new_key[1], self.count, cell))
+                self.open_key[cell] = self.count
+                continue
+            del self.open_key[cell]
+            expanded += 1
+            # the graph is undirected, so the cells that step into cell are its
+            # neighbours and the step costs the same both ways
+            old_g = g.get(cell, inf)
+            if old_g > rhs[cell]:
+                new_g = g[cell] = rhs[cell]
+                for prev, cost in self.successors(cell):
+                    # cell got cheaper, prev can only improve through it
+                    if prev != goal and cost + new_g < rhs.get(prev, inf):
+                        rhs[prev] = cost + new_g
+                        self.requeue(prev)
+            else:
+                g[cell] = inf
+                self.update(cell)
+                for prev, cost in self.successors(cell):
+                    # only the cells that were using cell need their rhs redone
+                    if prev != goal and rhs.get(prev, inf) == cost + old_g:
+                        self.update(prev)
+        self.expanded += expanded
+        return expanded
+
+    def apply_edits(self):
+        # every cell whose moves may have changed: the edited cell and everything around it
+        # (a diagonal between two of its neighbours squeezes past it)
+        cols, rows = self.grid.cols, self.grid.rows
+        touched = set()
+        for pos in self.pending:
+            row, col = pos
+            for dr, dc in ((0, 0),) + STRAIGHT + DIAGONAL:
+                r, c = row + dr, col + dc
+                if 0 <= r < rows and 0 <= c < cols:
+                    touched.add(r * cols + c)
+        self.pending.clear()
+        for cell in touched:
+            self.update(cell)
+
+    def move_start(self, pos):
+        # the agent moved, keys computed before stay valid thanks to km
+        self.km += self.heuristic(self.last, pos)
+        self.last = pos
+        self.start = pos
+
+    def plan(self):
+        # SearchResult from the current start to the goal; expanded is the work
+        # this call did, not the planner's total
+        if None in self.pending:
+            self.reset()
+        if self.pending:
+            self.apply_edits()
+        expanded = self.compute()
+
+        inf = float("inf")
+        g = self.g
+        cell = self.grid.cell_id(self.start)
+        # the loop may stop with start itself still overconsistent, rhs is its real cost
+        cost = self.rhs.get(cell, inf) if cell != self.goal_cell else 0
+        if cost == inf or self.grid.cells[cell]:
+            return SearchResult(False, [], inf, expanded, self.count, 0)
+        path = [cell]
+        while cell != self.goal_cell:
+            # walk downhill: the move that gives the cheapest cost-to-goal
+            cell = min(self.successors(cell), key=lambda step: step[1] + g.get(step[0], inf))[0]
+            path.append(cell)
+            if len(path) > len(self.grid):
+                raise RuntimeError("D* Lite state is inconsistent, call reset()")
+        pos = self.grid.pos
+        return SearchResult(True, [pos(c) for c in path], cost / COST_SCALE, expanded, self.count, 0)
@@ -0,0 +1,40 @@
+# cell state events the engines emit through their visit(pos, state) callback,
+# and a batcher so a client (the visualizer) can apply them a frame at a time
+# instead of once per event
+import time
+
+OPEN = "open"  # pushed on the open list
+CLOSED = "closed"  # expanded
+
+
+class EventBatcher:
+    # pass an instance as visit=...; flush(events) gets a list of (pos, state)
+    # every `every` expansions, or whenever 1/fps seconds have gone by, whichever
+    # is set (both may be). With neither set everything arrives in one batch at the end
+    def __init__(self, flush, every=None, fps=None, clock=time.perf_counter):
+        self.handler = flush
+        self.every = every
+        self.interval = 1.0 / fps if fps else None
+        self.clock = clock
+        self.events = []
+        self.expansions = 0
+        self.batches = 0
+        self.last_flush = clock()
+
+    def __call__(self, pos, state):
+        self.events.append((pos, state))
+        if state != CLOSED:
+            return
+        self.expansions += 1
+        if self.every and self.expansions % self.every == 0:
+            self.flush()
+        elif self.interval and self.clock() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        # hands over whatever is pending, call it once more after the search returns
+        if self.events:
+            events, self.events = self.events, []
+            self.batches += 1
+            self.handler(events)
+        self.last_flush = self.clock()
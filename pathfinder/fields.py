@@ -0,0 +1,142 @@
+# one-to-all distance fields and flow fields, for when lots of agents share a goal
+# (an exit, a depot): one pass from the source(s), then every agent walks the flow
+# field to the nearest source in O(path length) with no searching at all
+#
+# needs numpy, which the rest of the package doesn't, so it isn't imported by
+# pathfinder/__init__.py: from pathfinder.fields import distance_field
+#
+# the wavefront is a bucketed dijkstra done with whole-array numpy ops: every step
+# costs at least COST_SCALE, so all open cells within COST_SCALE of the smallest
+# open distance are final and get settled and relaxed together (terrain costs are
+# at least 1, so that holds with them too)
+import numpy as np
+
+from .heuristics import COST_SCALE
+from .neighbours import EIGHT_WAY
+
+UNREACHABLE = np.iinfo(np.int64).max // 2
+
+
+class DistanceField:
+    def __init__(self, grid, movement, distance, flow):
+        self.grid = grid
+        self.movement = movement
+        # (rows, cols) int64 in COST_SCALE units, UNREACHABLE where no source can be reached
+        self.distance = distance
+        # (rows, cols) int8 index into movement.moves of the first step towards the
+        # nearest source, -1 on the sources themselves and unreachable cells
+        self.flow = flow
+
+    def cost(self, pos):
+        # steps to the nearest source, inf if there is none
+        d = int(self.distance[pos])
+        return float("inf") if d >= UNREACHABLE else d / COST_SCALE
+
+    def path(self, pos):
+        # pos -> nearest source by following the flow field, [] if unreachable
+        if self.distance[pos] >= UNREACHABLE:
+            return []
+        moves = self.movement.moves
+        flow = self.flow
+        row, col = pos
+        path = [(row, col)]
+        step = flow[row, col]
+        while step >= 0:
+            dr, dc = moves[step]
+            row += dr
+            col += dc
+            path.append((row, col))
+            step = flow[row, col]
+        return path
+
+
+def _padded(grid):
+    # walkable mask with a one cell barrier border, so neighbour offsets never leave the array
+    cells = np.frombuffer(bytes(grid.cells), dtype=np.uint8).reshape(grid.rows, grid.cols)
+    free = np.zeros((grid.rows + 2, grid.cols + 2), dtype=bool)
+    free[1:-1, 1:-1] = cells == 0
+    return free.ravel()
+
+
+def _padded_costs(grid):
+    # terrain costs on the same padded layout, None without a cost layer
+    if grid.costs is None:
+        return None
+    costs = np.frombuffer(bytes(grid.costs), dtype=np.uint8).reshape(grid.rows, grid.cols)
+    padded = np.ones((grid.rows + 2, grid.cols + 2), dtype=np.int64)
+    padded[1:-1, 1:-1] = costs
+    return padded.ravel()
+
+
+def _moves(free, width, movement, costs=None):
+    # (delta, cost, allowed) per move, allowed[i] says the move out of padded cell i is legal
+    # with terrain costs, cost is an array: cost[i] for the move out of padded cell i
+    moves = []
+    for dr, dc in movement.moves:
+        delta = dr * width + dc
+        # the border cells are never free, so rolling can't wrap into a legal move
+        allowed = free & np.roll(free, -delta)
+        if dr and dc:
+            if not movement.cut_corners:
+                allowed &= np.roll(free, -dr * width) & np.roll(free, -dc)
+            cost = movement.diagonal_cost
+        else:
+            cost = COST_SCALE
+        if costs is not None:
+            cost = cost * (costs + np.roll(costs, -delta)) >> 1
+        moves.append((delta, cost, allowed))
+    return moves
+
+
+def distance_field(grid, sources, movement=EIGHT_WAY):
+    rows, cols = grid.rows, grid.cols
+    width = cols + 2
+    free = _padded(grid)
+    costs = _padded_costs(grid)
+    moves = _moves(free, width, movement, costs)
+
+    dist = np.full(free.shape, UNREACHABLE, dtype=np.int64)
+    settled = np.zeros(free.shape, dtype=bool)
+    opened = np.array(sorted({(r + 1) * width + c + 1 for r, c in sources if free[(r + 1) * width + c + 1]}),
+                      dtype=np.int64)
+    dist[opened] = 0
+
+    while opened.size:
+        open_dist = dist[opened]
+        # everything within one step of the closest open cell can't get any better
+        ready = open_dist < open_dist.min() + COST_SCALE * grid.min_cost
+        frontier = opened[ready]
+        settled[frontier] = True
+        waiting = opened[~ready]
+
+        reached = [waiting]
+        for delta, cost, allowed in moves:
+            ok = frontier[allowed[frontier]]
+            nxt = ok + delta
+            keep = ~settled[nxt]
+            nxt = nxt[keep]
+            if not nxt.size:
+                continue
+            ok = ok[keep]
+            candidate = dist[ok] + (cost if costs is None else cost[ok])
+            before = dist[nxt]
+            # several frontier cells can reach the same cell, minimum.at keeps the best
+            np.minimum.at(dist, nxt, candidate)
+            reached.append(nxt[dist[nxt] < before])
+        opened = np.unique(np.concatenate(reached))
+
+    # flow: the move whose cell is exactly one step closer (graph is undirected,
+    # so the moves out of a cell are also the moves into it)
+    best = np.full(free.shape, UNREACHABLE, dtype=np.int64)
+    flow = np.full(free.shape, -1, dtype=np.int8)
+    for index, (delta, cost, allowed) in enumerate(moves):
+        via = np.where(allowed, np.roll(dist, -delta), UNREACHABLE)
+        via = np.where(via < UNREACHABLE, via + cost, UNREACHABLE)
+        better = via < best
+        best[better] = via[better]
+        flow[better] = index
+    flow[(dist == 0) | (dist >= UNREACHABLE)] = -1
+
+    distance = dist.reshape(rows + 2, width)[1:-1, 1:-1].copy()
+    flow = flow.reshape(rows + 2, width)[1:-1, 1:-1].copy()
+    return DistanceField(grid, movement, distance, flow)
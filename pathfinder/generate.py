@@ -0,0 +1,341 @@
+# seeded map generators, every one returns a fresh Grid
+# the same seed always gives the same map (seed=None picks a random one), keep lists
+# positions that must stay walkable (start / end)
+#
+# everything is stdlib and works a row or the whole map at a time where it can:
+# random fill and binary tree mazes are bytes.translate / slice assignments,
+# sidewinder mazes add a few regex passes per row, caves run the automaton on the
+# whole map packed into one big int. Only the backtracker and kruskal mazes go cell
+# by cell, they take seconds on a 4000 x 4000 map where the rest take well under one
+import re
+from random import Random
+
+from .grid import BARRIER, FREE, Grid
+
+
+def _cols(rows, cols):
+    return rows if cols is None else cols
+
+
+def _finish(grid, keep):
+    for pos in keep:
+        grid.cells[grid.cell_id(pos)] = FREE
+    return grid
+
+
+def _threshold(density):
+    # random byte -> BARRIER with probability density (in 1/256 steps)
+    cut = round(min(max(density, 0.0), 1.0) * 256)
+    return bytes([BARRIER] * cut + [FREE] * (256 - cut))
+
+
+def random_fill(rows, cols=None, density=1 / 7, seed=None, keep=()):
+    # every cell is a barrier with probability density, what the M key does
+    cols = _cols(rows, cols)
+    cells = bytearray(Random(seed).randbytes(rows * cols).translate(_threshold(density)))
+    return _finish(Grid(rows, cols, cells), keep)
+
+
+# perfect mazes: exactly one path between any two open cells. Maze cells sit on
+# even (row, col), the odd rows / cols between them are walls with the doors
+# carved out, so (0, 0) is always open and an even sized map has a closed last row / col
+
+def _maze(rows, cols):
+    cells = bytearray([BARRIER]) * (rows * cols)
+    for row in range(0, rows, 2):
+        cells[row * cols:(row + 1) * cols:2] = bytes((cols + 1) // 2)
+    return cells
+
+
+def backtracker_maze(rows, cols=None, seed=None, keep=()):
+    # recursive backtracker (done with a stack): long winding corridors, few dead ends
+    cols = _cols(rows, cols)
+    rnd = Random(seed)
+    cells = _maze(rows, cols)
+    maze_rows = (rows + 1) // 2
+    maze_cols = (cols + 1) // 2
+    visited = bytearray(maze_rows * maze_cols)
+    visited[0] = 1
+    stack = [(0, 0)]
+    choice = rnd.choice
+    while stack:
+        row, col = stack[-1]
+        options = []
+        if row > 0 and not visited[(row - 1) * maze_cols + col]:
+            options.append((row - 1, col))
+        if row + 1 < maze_rows and not visited[(row + 1) * maze_cols + col]:
+            options.append((row + 1, col))
+        if col > 0 and not visited[row * maze_cols + col - 1]:
+            options.append((row, col - 1))
+        if col + 1 < maze_cols and not visited[row * maze_cols + col + 1]:
+            options.append((row, col + 1))
+        if not options:
+            stack.pop()
+            continue
+        next_row, next_col = choice(options)
+        visited[next_row * maze_cols + next_col] = 1
+        # the wall between the two is halfway
+        cells[(row + next_row) * cols + col + next_col] = FREE
+        stack.append((next_row, next_col))
+    return _finish(Grid(rows, cols, cells), keep)
+
+
+def kruskal_maze(rows, cols=None, seed=None, keep=()):
+    # randomized kruskal: knocks down walls in random order unless that makes a loop,
+    # lots of short dead ends
+    cols = _cols(rows, cols)
+    rnd = Random(seed)
+    cells = _maze(rows, cols)
+    maze_rows = (rows + 1) // 2
+    maze_cols = (cols + 1) // 2
+    # wall ids: 2 * cell for the one to the right, 2 * cell + 1 for the one below
+    walls = [2 * cell for cell in range(maze_rows * maze_cols) if (cell + 1) % maze_cols]
+    walls += [2 * cell + 1 for cell in range((maze_rows - 1) * maze_cols)]
+    rnd.shuffle(walls)
+    parent = list(range(maze_rows * maze_cols))
+    for wall in walls:
+        a, below = divmod(wall, 2)
+        b = a + maze_cols if below else a + 1
+        # find with path halving
+        while parent[a] != a:
+            parent[a] = a = parent[parent[a]]
+        while parent[b] != b:
+            parent[b] = b = parent[parent[b]]
+        if a == b:
+            continue
+        parent[a] = b
+        row, col = divmod(wall // 2, maze_cols)
+        if below:
+            cells[(2 * row + 1) * cols + 2 * col] = FREE
+        else:
+            cells[2 * row * cols + 2 * col + 1] = FREE
+    return _finish(Grid(rows, cols, cells), keep)
+
+
+# random byte -> 1 if the cell carves east, 0 if it carves north
+_EAST = bytes([0] * 128 + [1] * 128)
+_EAST_WALL = bytes([BARRIER, FREE]) + bytes(254)  # 1 (east) opens the wall to the right
+_NORTH_WALL = bytes([FREE, BARRIER]) + bytes(254)  # 0 (north) opens the wall above
+
+
+def binary_tree_maze(rows, cols=None, seed=None, keep=()):
+    # every cell opens the wall north or east of it (the top row always east, the
+    # last column always north): a perfect maze built a whole row at a time, by far
+    # the fastest one, with a diagonal bias and open top row / last column
+    cols = _cols(rows, cols)
+    rnd = Random(seed)
+    cells = _maze(rows, cols)
+    maze_cols = (cols + 1) // 2
+    between = cols // 2  # wall cells between maze cells in a row, plus the edge when cols is even
+    for row in range(0, rows, 2):
+        if row == 0:
+            east = bytearray([1]) * maze_cols
+        else:
+            east = bytearray(rnd.randbytes(maze_cols).translate(_EAST))
+        east[-1] = 0 if row else 1
+        start = row * cols
+        cells[start + 1:start + cols:2] = east[:between].translate(_EAST_WALL)
+        if between == maze_cols:
+            cells[start + cols - 1] = BARRIER  # no door out of the map on the right
+        if row:
+            cells[start - cols:start:2] = east.translate(_NORTH_WALL)
+    return _finish(Grid(rows, cols, cells), keep)
+
+
+# sidewinder symbols, one per maze cell of a row: D / E carve north (E with a coin
+# saying "close the run here"), o / c don't (c with the coin). Random byte -> symbol:
+_SIDE = bytes(b"oDcE"[byte % 4] for byte in range(256))
+# every run needs exactly one door, so between two doors exactly one east wall is
+# closed: the last coin before the next door (X, Y when it is on the door itself),
+# or with no coin in between the first door's (F)
+_LAST_COIN = re.compile(rb"c(?=o*[DE])")
+_DOOR_COIN = re.compile(rb"E(?=o*[DE])")
+_NO_COIN = re.compile(rb"D(?=o*[DEY])")
+_SIDE_EAST = bytes(BARRIER if ch in b"XYF" else FREE for ch in range(256))
+_SIDE_NORTH = bytes(FREE if ch in b"DEYF" else BARRIER for ch in range(256))
+
+
+def sidewinder_maze(rows, cols=None, seed=None, keep=()):
+    # rows of east-west runs, each with one door north (the top row is one long run):
+    # a perfect maze with a lot less bias than binary_tree_maze, still built a whole
+    # row at a time, the runs are cut with regex substitutions instead of a loop
+    cols = _cols(rows, cols)
+    rnd = Random(seed)
+    cells = _maze(rows, cols)
+    maze_cols = (cols + 1) // 2
+    between = cols // 2
+    for row in range(0, rows, 2):
+        start = row * cols
+        if row:
+            line = bytearray(rnd.randbytes(maze_cols).translate(_SIDE))
+            doors = [i for i in (line.find(b"D"), line.find(b"E")) if i >= 0]
+            if doors:
+                first = min(doors)
+            else:
+                first = rnd.randrange(maze_cols)
+                line[first] = ord("D")
+            # cells before the first door join its run, after the last door the last run
+            tail = _LAST_COIN.sub(b"X", bytes(line[first:]))
+            tail = _DOOR_COIN.sub(b"Y", tail)
+            line[first:] = _NO_COIN.sub(b"F", tail)
+            cells[start + 1:start + cols:2] = line[:between].translate(_SIDE_EAST)
+            cells[start - cols:start:2] = line.translate(_SIDE_NORTH)
+        else:
+            cells[start + 1:start + cols:2] = bytes(between)
+        if between == maze_cols:
+            cells[start + cols - 1] = BARRIER  # no door out of the map on the right
+    return _finish(Grid(rows, cols, cells), keep)
+
+
+def rooms(rows, cols=None, seed=None, keep=(), min_size=4, max_size=12, loops=0.1):
+    # rectangular rooms joined by one wide corridors. The map is cut into sectors
+    # of max_size + 2, every sector gets a room somewhere inside it, then the rooms
+    # are joined along a random spanning tree of the sectors plus a loops fraction
+    # of extra doors, so every room can reach every other
+    cols = _cols(rows, cols)
+    random = Random(seed).random
+    cells = bytearray([BARRIER]) * (rows * cols)
+    sector = max_size + 2
+    sector_rows = max(rows // sector, 1)
+    sector_cols = max(cols // sector, 1)
+    # maps too thin for a wall round the rooms get rooms right up to the edge
+    edge_rows = 1 if rows > 2 else 0
+    edge_cols = 1 if cols > 2 else 0
+    # room for a room in every sector, less in a lone sector on a map smaller than one
+    space_rows = min(sector - 2, rows - 2 * edge_rows)
+    space_cols = min(sector - 2, cols - 2 * edge_cols)
+    low_height, high_height = min(min_size, space_rows), min(max_size, space_rows)
+    low_width, high_width = min(min_size, space_cols), min(max_size, space_cols)
+    centers = []
+    for sr in range(sector_rows):
+        for sc in range(sector_cols):
+            # random() instead of randint(), this runs for every sector of the map
+            height = low_height + int(random() * (high_height - low_height + 1))
+            width = low_width + int(random() * (high_width - low_width + 1))
+            top = sr * sector + edge_rows + int(random() * (space_rows - height + 1))
+            left = sc * sector + edge_cols + int(random() * (space_cols - width + 1))
+            hole = bytes(width)
+            for start in range(top * cols + left, (top + height) * cols, cols):
+                cells[start:start + width] = hole
+            centers.append((top + height // 2, left + width // 2))
+
+    def corridor(a, b):
+        # horizontal at a's row, then vertical at b's column
+        (row, col), (end_row, end_col) = a, b
+        low, high = min(col, end_col), max(col, end_col)
+        cells[row * cols + low:row * cols + high + 1] = bytes(high - low + 1)
+        low, high = min(row, end_row), max(row, end_row)
+        cells[low * cols + end_col:high * cols + end_col + 1:cols] = bytes(high - low + 1)
+
+    # spanning tree: every sector joins the one left of it or above it
+    # (first row always left, first column always up), then a few extra doors
+    for sr in range(sector_rows):
+        for sc in range(sector_cols):
+            here = sr * sector_cols + sc
+            left = here - 1 if sc else None
+            up = here - sector_cols if sr else None
+            if left is not None and (up is None or random() < 0.5):
+                corridor(centers[here], centers[left])
+                if up is not None and random() < loops:
+                    corridor(centers[here], centers[up])
+            elif up is not None:
+                corridor(centers[here], centers[up])
+                if left is not None and random() < loops:
+                    corridor(centers[here], centers[left])
+    return _finish(Grid(rows, cols, cells), keep)
+
+
+# caves work on the map as one int, bit 1 + i = cell i of a map padded with a wall
+# column on the right and a wall row on both ends (plus a wall bit 0 in front of
+# it all), so shifting by a neighbour offset never wraps around or falls off
+
+def _random_bits(rnd, bits, density):
+    # an int with bits random bits, each set with probability density (8 bit precision):
+    # walks the binary expansion of density from the last digit, and-ing for a 0 and
+    # or-ing for a 1 with a fresh fair random number
+    level = round(min(max(density, 0.0), 1.0) * 256)
+    if level == 256:
+        return (1 << bits) - 1
+    result = 0
+    for digit in range(8):
+        if level >> digit & 1:
+            result |= rnd.getrandbits(bits)
+        else:
+            result &= rnd.getrandbits(bits)
+    return result
+
+
+def _count(planes):
+    # bit-sliced population count of the planes: [1s, 2s, 4s, 8s] digits per bit
+    digits = [0, 0, 0, 0]
+    for carry in planes:
+        for i in range(4):
+            digits[i], carry = digits[i] ^ carry, digits[i] & carry
+            if not carry:
+                break
+    return digits
+
+
+def _at_least(digits, k, everything):
+    # bits whose count (as digits from _count) is >= k
+    greater = 0
+    equal = everything
+    for i in reversed(range(len(digits))):
+        if k >> i & 1:
+            equal &= digits[i]
+        else:
+            greater |= equal & digits[i]
+            equal &= ~digits[i]
+    return greater | equal
+
+
+# "0" / "1" digits -> FREE / BARRIER
+_DIGITS = bytes(BARRIER if ch == ord("1") else FREE for ch in range(256))
+
+
+def caves(rows, cols=None, seed=None, keep=(), density=0.45, steps=4, birth=5, survive=4):
+    # cellular automaton caves: random fill at density, then steps rounds of
+    # "a wall is a wall with survive+ wall neighbours, an open cell becomes one with
+    # birth+" (the map edge counts as wall). Not guaranteed to be connected
+    cols = _cols(rows, cols)
+    rnd = Random(seed)
+    width = cols + 1
+    bits = (rows + 2) * width + 1
+    # rows copies of a full row, doubled up instead of or-ing in one row at a time
+    inside = (1 << cols) - 1
+    copies = 1
+    while copies < rows:
+        inside |= inside << copies * width
+        copies *= 2
+    inside = (inside & ((1 << rows * width) - 1)) << 1 + width
+    everything = (1 << bits) - 1
+    border = everything & ~inside
+    state = (_random_bits(rnd, bits, density) & inside) | border
+    shifts = (1, width - 1, width, width + 1)
+    for _ in range(steps):
+        planes = []
+        for shift in shifts:
+            planes.append(state >> shift)
+            planes.append((state << shift) & everything)
+        digits = _count(planes)
+        state = (_at_least(digits, birth, everything)
+                 | (state & _at_least(digits, survive, everything)))
+        state = (state & inside) | border
+    # binary digits, highest bit first: reversed that is one byte per padded cell
+    padded = format(state, "b").zfill(bits)[::-1].encode().translate(_DIGITS)
+    cells = bytearray()
+    for row in range(1, rows + 1):
+        cells += padded[1 + row * width:1 + row * width + cols]
+    return _finish(Grid(rows, cols, cells), keep)
+
+
+# by name, for scripts and benchmarks
+GENERATORS = {
+    "fill": random_fill,
+    "backtracker": backtracker_maze,
+    "kruskal": kruskal_maze,
+    "binary_tree": binary_tree_maze,
+    "sidewinder": sidewinder_maze,
+    "rooms": rooms,
+    "caves": caves,
+}
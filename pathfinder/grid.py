@@ -0,0 +1,211 @@
+# headless grid: only knows which cells are barriers, no pygame in here
+# cells are stored in one flat bytearray (row major), 0 = walkable, 1 = barrier
+# and every cell has an integer id: row * cols + col
+#
+# edits made through make_barrier / reset / clear bump grid.version and are passed
+# to every subscribed listener as listener(pos, barrier), pos is None after clear().
+# writing to grid.cells directly skips all of that
+#
+# terrain costs are an optional second layer: grid.costs stays None until a cost is
+# first set, then it is a bytearray like cells with one cost per cell, 1 to 255 (1 =
+# plain ground). A step between two cells costs its usual length times the average
+# of their two costs, so it costs the same both ways. Cost edits made through
+# set_cost / fill_costs / set_costs bump grid.cost_version and go to the listeners
+# subscribed with subscribe_costs as listener(box), box = (top, left, bottom, right)
+# inclusive or None for the whole map. They aren't barrier edits: grid.version and
+# the barrier listeners don't hear about them. The layer is only ever written in
+# place, so neighbour functions made after it exists see every update
+
+from collections import Counter
+
+FREE = 0
+BARRIER = 1
+
+MIN_COST = 1
+MAX_COST = 255
+
+
+class Grid:
+    def __init__(self, rows, cols=None, cells=None):
+        self.rows = rows
+        self.cols = rows if cols is None else cols
+        size = self.rows * self.cols
+        if cells is None:
+            cells = bytearray(size)
+        elif len(cells) != size:
+            raise ValueError("expected %d cells, got %d" % (size, len(cells)))
+        self.cells = cells
+        self.version = 0
+        self.listeners = []
+        self.costs = None
+        self.cost_counts = None  # cost_counts[cost]: cells with that cost, once there are costs
+        self.min_cost = MIN_COST  # the cheapest cost on the map, heuristics are scaled by it
+        self.weighted = False  # some cell costs more than 1
+        self.cost_version = 0
+        self.cost_listeners = []
+
+    def __getstate__(self):
+        # listeners belong to this process, don't send them along with the cells
+        state = self.__dict__.copy()
+        state["listeners"] = []
+        state["cost_listeners"] = []
+        return state
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def _edited(self, pos, barrier):
+        self.version += 1
+        for listener in self.listeners:
+            listener(pos, barrier)
+
+    def subscribe_costs(self, listener):
+        self.cost_listeners.append(listener)
+
+    def unsubscribe_costs(self, listener):
+        self.cost_listeners.remove(listener)
+
+    def _costs_edited(self, box):
+        # min_cost / weighted from the counts, the layer itself isn't looked at
+        counts = self.cost_counts
+        cost = MIN_COST
+        while not counts[cost]:
+            cost += 1
+        self.min_cost = cost
+        self.weighted = counts[MIN_COST] != len(self.costs)
+        self.cost_version += 1
+        for listener in self.cost_listeners:
+            listener(box)
+
+    def _cost_layer(self):
+        if self.costs is None:
+            self.costs = bytearray([MIN_COST]) * len(self.cells)
+            self.cost_counts = [0] * (MAX_COST + 1)
+            self.cost_counts[MIN_COST] = len(self.cells)
+        return self.costs
+
+    def _count_costs(self, values, step):
+        # add (step 1) or take away (step -1) the costs in values from cost_counts
+        counts = self.cost_counts
+        for cost, count in Counter(values).items():
+            counts[cost] += step * count
+
+    @classmethod
+    def from_strings(cls, lines, barrier="#"):
+        # handy for scripts: every line is a row, barrier chars are obstacles
+        lines = [line for line in lines if line]
+        grid = cls(len(lines), max(len(line) for line in lines))
+        for row, line in enumerate(lines):
+            for col, ch in enumerate(line):
+                if ch == barrier:
+                    grid.make_barrier((row, col))
+        return grid
+
+    @classmethod
+    def from_array(cls, array):
+        # any 2d uint8/bool array (numpy works too), non zero = barrier
+        rows = len(array)
+        cols = len(array[0]) if rows else 0
+        cells = bytearray(rows * cols)
+        for row in range(rows):
+            for col, value in enumerate(array[row]):
+                if value:
+                    cells[row * cols + col] = BARRIER
+        return cls(rows, cols, cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def cell_id(self, pos):
+        row, col = pos
+        return row * self.cols + col
+
+    def pos(self, cell):
+        return divmod(cell, self.cols)
+
+    def in_bounds(self, pos):
+        row, col = pos
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def is_barrier(self, pos):
+        row, col = pos
+        return self.cells[row * self.cols + col] == BARRIER
+
+    def make_barrier(self, pos):
+        row, col = pos
+        cell = row * self.cols + col
+        if self.cells[cell] != BARRIER:
+            self.cells[cell] = BARRIER
+            self._edited(pos, True)
+
+    def reset(self, pos):
+        row, col = pos
+        cell = row * self.cols + col
+        if self.cells[cell] != FREE:
+            self.cells[cell] = FREE
+            self._edited(pos, False)
+
+    def clear(self):
+        # barriers only, the terrain costs stay
+        self.cells[:] = bytes(len(self.cells))
+        self._edited(None, False)
+
+    def cost(self, pos):
+        if self.costs is None:
+            return MIN_COST
+        row, col = pos
+        return self.costs[row * self.cols + col]
+
+    def set_cost(self, pos, cost):
+        if not MIN_COST <= cost <= MAX_COST:
+            raise ValueError("terrain costs go from %d to %d, got %r" % (MIN_COST, MAX_COST, cost))
+        row, col = pos
+        cell = row * self.cols + col
+        costs = self._cost_layer()
+        self.cost_counts[costs[cell]] -= 1
+        self.cost_counts[cost] += 1
+        costs[cell] = cost
+        self._costs_edited((row, col, row, col))
+
+    def fill_costs(self, cost, box=None):
+        # one cost for every cell in box (top, left, bottom, right inclusive), or all of them
+        if not MIN_COST <= cost <= MAX_COST:
+            raise ValueError("terrain costs go from %d to %d, got %r" % (MIN_COST, MAX_COST, cost))
+        costs = self._cost_layer()
+        if box is None:
+            costs[:] = bytes([cost]) * len(costs)
+            self.cost_counts = [0] * (MAX_COST + 1)
+            self.cost_counts[cost] = len(costs)
+        else:
+            top, left, bottom, right = box
+            top, left = max(top, 0), max(left, 0)
+            bottom, right = min(bottom, self.rows - 1), min(right, self.cols - 1)
+            run = bytes([cost]) * (right - left + 1)
+            for row in range(top, bottom + 1):
+                start = row * self.cols + left
+                self._count_costs(costs[start:start + len(run)], -1)
+                costs[start:start + len(run)] = run
+            self.cost_counts[cost] += len(run) * max(bottom - top + 1, 0)
+        self._costs_edited(box)
+
+    def set_costs(self, costs):
+        # the whole layer at once: rows * cols values in row major order, any bytes
+        # like object (a flat uint8 numpy array, a bytearray) or a list of ints
+        costs = bytes(costs)
+        if len(costs) != len(self.cells):
+            raise ValueError("expected %d costs, got %d" % (len(self.cells), len(costs)))
+        if 0 in costs:
+            raise ValueError("terrain costs go from %d to %d, got 0" % (MIN_COST, MAX_COST))
+        self._cost_layer()[:] = costs
+        self.cost_counts = [0] * (MAX_COST + 1)
+        self._count_costs(costs, 1)
+        self._costs_edited(None)
+
+    def copy(self):
+        grid = Grid(self.rows, self.cols, bytearray(self.cells))
+        if self.costs is not None:
+            grid.set_costs(self.costs)
+        return grid
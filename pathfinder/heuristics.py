@@ -0,0 +1,49 @@
+# heuristics, all in fixed point: one straight step costs COST_SCALE
+# so the engines only ever add and compare integers
+COST_SCALE = 1000
+# round(sqrt(2) * COST_SCALE), the cost of a diagonal step
+DIAGONAL_COST = 1414
+
+
+def zero(p1, p2):
+    # dijkstra
+    return 0
+
+
+def manhattan(p1, p2):
+    # exact on an empty 4-connected grid
+    return (abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])) * COST_SCALE
+
+
+def octile(p1, p2):
+    # exact on an empty 8-connected grid with sqrt(2) diagonals
+    dx = abs(p1[0] - p2[0])
+    dy = abs(p1[1] - p2[1])
+    if dx < dy:
+        dx, dy = dy, dx
+    return dx * COST_SCALE + dy * (DIAGONAL_COST - COST_SCALE)
+
+
+def chebyshev(p1, p2):
+    # exact on an empty 8-connected grid where diagonals cost the same as straight steps
+    return max(abs(p1[0] - p2[0]), abs(p1[1] - p2[1])) * COST_SCALE
+
+
+def euclidean(p1, p2):
+    # admissible for FOUR_WAY and EIGHT_WAY but never tight (rounded down to stay admissible),
+    # overestimates when diagonals cost a single step
+    x1, y1 = p1
+    x2, y2 = p2
+    return int(((x1-x2)**2 + (y1-y2)**2)**0.5 * COST_SCALE)
+
+
+def scaled(heuristic, factor):
+    # heuristic for a grid whose cheapest terrain cost is factor (grid.min_cost): every
+    # step there costs at least factor times its length, so factor * h stays admissible
+    if factor == 1 or heuristic is zero:
+        return heuristic
+
+    def terrain(p1, p2):
+        return heuristic(p1, p2) * factor
+
+    return terrain
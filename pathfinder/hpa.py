@@ -0,0 +1,365 @@
+# hierarchical path finding (HPA*) for very big grids
+#
+# the grid is cut into square clusters. Where two clusters touch, every run of free
+# cell pairs across the border is an entrance, with one transition in the middle
+# (or one at each end for long runs). The transition cells are the abstract nodes:
+# nodes in the same cluster are linked by their distance inside that cluster
+# (precomputed) and the two cells of a transition by a single step.
+#
+# a query connects start and end to the nodes of their clusters, runs A* over that
+# small abstract graph and only turns the abstract path into cells (one search
+# inside one cluster per abstract edge) when result.path is read.
+# paths are near optimal, not optimal: they can only cross borders at transitions.
+#
+# barrier edits through the grid mark their cluster dirty, the next query rebuilds
+# just that cluster and whichever neighbours had their shared entrances change.
+# Distances are lengths, so grids with terrain costs (grid.py) aren't supported, and
+# clusters only meet through straight border steps, so neither are corner cutting
+# movements (EIGHT_WAY_UNIFORM): a diagonal squeezing past a cluster corner can be
+# the only way through
+import sys
+import time
+from heapq import heappop, heappush
+
+from .components import movement_cuts_corners
+from .heuristics import COST_SCALE
+from .grid import Grid
+from .neighbours import EIGHT_WAY, expander
+from .search import SearchResult
+
+CLUSTER_SIZE = 16
+# runs of free border pairs at least this long get a transition at both ends
+LONG_ENTRANCE = 6
+
+
+class HPAResult(SearchResult):
+    # path is refined from the abstract path the first time it is read
+    def __init__(self, found, abstract, cost, expanded, refine):
+        self.found = found
+        self.abstract = abstract  # positions of the abstract nodes the path goes through
+        self.cost = cost
+        self.expanded = expanded  # abstract nodes expanded
+        self.pushes = 0
+        self.stale = 0
+        self._refine = refine
+        self._path = None
+
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = self._refine(self.abstract) if self.found else []
+        return self._path
+
+    def __repr__(self):
+        return "HPAResult(found=%r, cost=%r, expanded=%r, abstract=%d)" % (
+            self.found, self.cost, self.expanded, len(self.abstract))
+
+
+class HierarchicalGrid:
+    def __init__(self, grid, cluster_size=CLUSTER_SIZE, movement=EIGHT_WAY):
+        if grid.weighted:
+            raise ValueError("HPA* needs a grid without terrain costs")
+        if movement_cuts_corners(movement):
+            raise ValueError("HPA* doesn't support corner cutting movements")
+        self.grid = grid
+        self.size = cluster_size
+        self.movement = movement
+        self.heuristic = movement.heuristic
+        self.cluster_rows = -(-grid.rows // cluster_size)
+        self.cluster_cols = -(-grid.cols // cluster_size)
+        # (cluster, cluster) -> [(cell in first, cell in second)], the first cluster
+        # is always the one above / to the left
+        self.borders = {}
+        # cluster -> {node: {node: cost}} distances inside the cluster
+        self.intra = {}
+        # node -> [(node, cost)] steps across borders
+        self.inter = {}
+        self.dirty = set()
+        self.locals = {}
+        began = time.perf_counter()
+        for cluster in self.clusters():
+            for border in self.cluster_borders(cluster):
+                if border not in self.borders:
+                    self.borders[border] = self.entrances(*border)
+        for cluster in self.clusters():
+            self.intra[cluster] = self.link(cluster)
+        for pairs in self.borders.values():
+            self.link_border(pairs)
+        self.build_time = time.perf_counter() - began
+        grid.subscribe(self.edited)
+
+    def close(self):
+        self.grid.unsubscribe(self.edited)
+
+    # clusters
+
+    def clusters(self):
+        return [(r, c) for r in range(self.cluster_rows) for c in range(self.cluster_cols)]
+
+    def cluster_of(self, cell):
+        row, col = divmod(cell, self.grid.cols)
+        return row // self.size, col // self.size
+
+    def box(self, cluster):
+        # (top, left, bottom, right) inclusive
+        r, c = cluster
+        size = self.size
+        return (r * size, c * size, min((r + 1) * size, self.grid.rows) - 1,
+                min((c + 1) * size, self.grid.cols) - 1)
+
+    def cluster_borders(self, cluster):
+        r, c = cluster
+        borders = []
+        if r > 0:
+            borders.append(((r - 1, c), cluster))
+        if c > 0:
+            borders.append(((r, c - 1), cluster))
+        if r < self.cluster_rows - 1:
+            borders.append((cluster, (r + 1, c)))
+        if c < self.cluster_cols - 1:
+            borders.append((cluster, (r, c + 1)))
+        return borders
+
+    def entrances(self, first, second):
+        cells, cols = self.grid.cells, self.grid.cols
+        top, left, bottom, right = self.box(first)
+        if first[0] == second[0]:
+            # side by side, pairs run down the shared edge
+            pairs = [(row * cols + right, row * cols + right + 1) for row in range(top, bottom + 1)]
+        else:
+            pairs = [(bottom * cols + col, (bottom + 1) * cols + col) for col in range(left, right + 1)]
+        transitions = []
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and not cells[a] and not cells[b]:
+                run.append((a, b))
+                continue
+            if len(run) >= LONG_ENTRANCE:
+                transitions.extend((run[0], run[-1]))
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        return transitions
+
+    def nodes(self, cluster):
+        found = set()
+        for border in self.cluster_borders(cluster):
+            side = 0 if border[0] == cluster else 1
+            for pair in self.borders[border]:
+                found.add(pair[side])
+        return found
+
+    # searches inside one cluster
+
+    def local(self, cluster):
+        # the cluster copied out into its own small Grid, so searches inside it need
+        # no bounds checks of their own; cached until the cluster is rebuilt
+        found = self.locals.get(cluster)
+        if found is None:
+            top, left, bottom, right = self.box(cluster)
+            cols = self.grid.cols
+            width = right - left + 1
+            cells = bytearray()
+            for row in range(top, bottom + 1):
+                cells += self.grid.cells[row * cols + left:row * cols + right + 1]
+            found = self.locals[cluster] = (top, left, width,
+                                            expander(Grid(bottom - top + 1, width, cells), self.movement))
+        return found
+
+    def inside(self, source, targets, cluster, came_from=None):
+        # dijkstra from source that never leaves cluster, {target: cost} for the
+        # targets it reached; fills came_from (global cell ids) if given
+        top, left, width, neighbours = self.local(cluster)
+        cols = self.grid.cols
+
+        def to_local(cell):
+            row, col = divmod(cell, cols)
+            return (row - top) * width + col - left
+
+        def to_global(cell):
+            row, col = divmod(cell, width)
+            return (row + top) * cols + col + left
+
+        remaining = {to_local(t): t for t in targets}
+        found = {}
+        start = to_local(source)
+        g_score = {start: 0}
+        parent = {}
+        done = set()
+        pri_queue = [(0, start)]
+        while pri_queue and remaining:
+            current_g, current = heappop(pri_queue)
+            if current in done:
+                continue
+            done.add(current)
+            if current in remaining:
+                found[remaining.pop(current)] = current_g
+            for neighbour, cost in neighbours(current):
+                temp_g_score = current_g + cost
+                if temp_g_score < g_score.get(neighbour, temp_g_score + 1):
+                    g_score[neighbour] = temp_g_score
+                    parent[neighbour] = current
+                    heappush(pri_queue, (temp_g_score, neighbour))
+        if came_from is not None:
+            for cell, prev in parent.items():
+                came_from[to_global(cell)] = to_global(prev)
+        return found
+
+    def link(self, cluster):
+        nodes = sorted(self.nodes(cluster))
+        links = {}
+        for i, node in enumerate(nodes):
+            links.setdefault(node, {})
+            for other, cost in self.inside(node, nodes[i + 1:], cluster).items():
+                links[node][other] = cost
+                links.setdefault(other, {})[node] = cost
+        return links
+
+    def link_border(self, pairs):
+        inter = self.inter
+        for a, b in pairs:
+            inter.setdefault(a, []).append((b, COST_SCALE))
+            inter.setdefault(b, []).append((a, COST_SCALE))
+
+    def unlink_border(self, pairs):
+        inter = self.inter
+        for a, b in pairs:
+            for node, other in ((a, b), (b, a)):
+                steps = inter[node]
+                steps.remove((other, COST_SCALE))
+                if not steps:
+                    del inter[node]
+
+    # edits
+
+    def edited(self, pos, barrier):
+        # grid listener, pos None means the whole grid changed
+        if pos is None:
+            self.dirty.update(self.clusters())
+        else:
+            self.dirty.add(self.cluster_of(self.grid.cell_id(pos)))
+
+    def rebuild(self):
+        began = time.perf_counter()
+        relink = set(self.dirty)
+        for cluster in self.dirty:
+            self.locals.pop(cluster, None)
+            for border in self.cluster_borders(cluster):
+                transitions = self.entrances(*border)
+                if transitions != self.borders[border]:
+                    # only the steps across this border change
+                    self.unlink_border(self.borders[border])
+                    self.borders[border] = transitions
+                    self.link_border(transitions)
+                    relink.update(border)
+        for cluster in relink:
+            self.intra[cluster] = self.link(cluster)
+        self.dirty.clear()
+        self.rebuild_time = time.perf_counter() - began
+        return relink
+
+    def stats(self):
+        # size of the abstraction and what it cost to build
+        nodes = sum(len(links) for links in self.intra.values())
+        intra_edges = sum(len(others) for links in self.intra.values() for others in links.values()) // 2
+        inter_edges = sum(len(pairs) for pairs in self.borders.values())
+        nbytes = sys.getsizeof(self.intra) + sys.getsizeof(self.inter) + sys.getsizeof(self.borders)
+        for links in self.intra.values():
+            nbytes += sys.getsizeof(links) + sum(sys.getsizeof(others) for others in links.values())
+        nbytes += sum(sys.getsizeof(steps) for steps in self.inter.values())
+        nbytes += sum(sys.getsizeof(pairs) for pairs in self.borders.values())
+        return {
+            "clusters": self.cluster_rows * self.cluster_cols,
+            "nodes": nodes,
+            "intra_edges": intra_edges,
+            "inter_edges": inter_edges,
+            "bytes": nbytes,
+            "build_seconds": self.build_time,
+        }
+
+    # queries
+
+    def search(self, start, end):
+        if self.grid.weighted:
+            raise ValueError("HPA* needs a grid without terrain costs")
+        if self.dirty:
+            self.rebuild()
+        grid = self.grid
+        pos = grid.pos
+        source = grid.cell_id(start)
+        target = grid.cell_id(end)
+        inf = float("inf")
+        if grid.cells[source] or grid.cells[target]:
+            return HPAResult(False, [], inf, 0, self.refine)
+
+        # hook start and end up to the nodes of their clusters
+        start_cluster = self.cluster_of(source)
+        end_cluster = self.cluster_of(target)
+        start_links = self.inside(source, list(self.intra[start_cluster]) + [target]
+                                  if start_cluster == end_cluster else self.intra[start_cluster], start_cluster)
+        end_links = self.inside(target, self.intra[end_cluster], end_cluster)
+
+        def links(cell):
+            if cell == source:
+                # start may be a node itself, then it keeps its border steps
+                found = list(start_links.items())
+            else:
+                found = list(self.intra[self.cluster_of(cell)].get(cell, {}).items())
+            found.extend(self.inter.get(cell, ()))
+            if cell in end_links:
+                found.append((target, end_links[cell]))
+            return found
+
+        # A* over the abstract graph, same open list as search.py
+        heuristic = self.heuristic
+        came_from = {}
+        g_score = {source: 0}
+        start_h = heuristic(start, end)
+        pri_queue = [(start_h, start_h, 0, source)]
+        open_entry = {source: 0}
+        count = 0
+        expanded = 0
+        while pri_queue:
+            entry = heappop(pri_queue)
+            current = entry[3]
+            if open_entry.get(current) != entry[2]:
+                continue
+            del open_entry[current]
+            expanded += 1
+            if current == target:
+                abstract = [current]
+                while abstract[-1] in came_from:
+                    abstract.append(came_from[abstract[-1]])
+                abstract.reverse()
+                return HPAResult(True, [pos(cell) for cell in abstract], g_score[target] / COST_SCALE,
+                                 expanded, self.refine)
+            current_g = g_score[current]
+            for neighbour, cost in links(current):
+                temp_g_score = current_g + cost
+                if temp_g_score < g_score.get(neighbour, inf):
+                    came_from[neighbour] = current
+                    g_score[neighbour] = temp_g_score
+                    h_score = heuristic(pos(neighbour), end)
+                    count += 1
+                    heappush(pri_queue, (temp_g_score + h_score, h_score, count, neighbour))
+                    open_entry[neighbour] = count
+        return HPAResult(False, [], inf, expanded, self.refine)
+
+    def refine(self, abstract):
+        # abstract nodes -> every cell in between
+        grid = self.grid
+        cell_id, pos = grid.cell_id, grid.pos
+        path = [abstract[0]]
+        for a, b in zip(abstract, abstract[1:]):
+            a, b = cell_id(a), cell_id(b)
+            cluster = self.cluster_of(a)
+            if cluster != self.cluster_of(b):
+                path.append(pos(b))  # a border step
+                continue
+            came_from = {}
+            self.inside(a, [b], cluster, came_from)
+            leg = [b]
+            while leg[-1] != a:
+                leg.append(came_from[leg[-1]])
+            path.extend(pos(cell) for cell in reversed(leg[:-1]))
+        return path
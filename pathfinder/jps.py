@@ -0,0 +1,282 @@
+# jump point search: A* for uniform cost 8-connected grids (EIGHT_WAY, no corner cutting)
+# that only puts jump points on the open list instead of every cell on a symmetric path
+# same open list and result as search.py, path lengths are identical to astar
+# straight jumps don't walk cell by cell: rows and columns are kept as python ints
+# (one bit per cell) and the next wall / forced neighbour is found with shifts
+from heapq import heappop, heappush
+
+from .events import CLOSED, OPEN
+from .heuristics import COST_SCALE, DIAGONAL_COST, octile
+from .neighbours import DIAGONAL, EIGHT_WAY, STRAIGHT
+from .search import SearchResult
+
+
+def _line(a, b):
+    # every cell from a to b along a straight or diagonal segment
+    (r1, c1), (r2, c2) = a, b
+    dr = (r2 > r1) - (r2 < r1)
+    dc = (c2 > c1) - (c2 < c1)
+    cells = []
+    while (r1, c1) != (r2, c2):
+        r1 += dr
+        c1 += dc
+        cells.append((r1, c1))
+    return cells
+
+
+# cell byte -> the digit it stands for in a line's bits
+_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def _bits(data, size):
+    # cells (0 / 1 bytes) -> int with bit i set for a barrier at i, and bit size
+    # (just past the end) set as well so there is always a wall ahead
+    return int(bytes(data).translate(_BITS)[::-1] or b"0", 2) | 1 << size
+
+
+def _forced(side_a, side_b, step):
+    # bit i set where moving along the line by step, a side cell of i is free and the
+    # one behind it isn't: a forced neighbour, so i is a jump point
+    # a side off the grid is -1 (all barrier), which never opens up
+    if step > 0:
+        return ~side_a & side_a << 1 | ~side_b & side_b << 1
+    return ~side_a & side_a >> 1 | ~side_b & side_b >> 1
+
+
+def jps(grid, start, end, visit=None, movement=EIGHT_WAY, heuristic=None):
+    if movement is not EIGHT_WAY:
+        raise ValueError("jump point search only supports EIGHT_WAY movement")
+    if grid.weighted:
+        # a jump skips cells it never prices, it is only right when every step costs its length
+        raise ValueError("jump point search needs a grid without terrain costs")
+    if heuristic is None:
+        heuristic = octile
+    rows, cols, cells = grid.rows, grid.cols, grid.cells
+    start_row, start_col = start
+    end_row, end_col = end
+
+    # every row and column as one int, bit i set = barrier, built the first time a jump
+    # runs along it, and per direction the jump points on it: forced neighbours plus
+    # the end. A straight jump is then a few shifts over the whole line instead of a
+    # python loop over its cells
+    row_bits = [None] * rows
+    col_bits = [None] * cols
+    east, west = [None] * rows, [None] * rows
+    south, north = [None] * cols, [None] * cols
+
+    def row_line(r):
+        if not 0 <= r < rows:
+            return -1
+        bits = row_bits[r]
+        if bits is None:
+            bits = row_bits[r] = _bits(cells[r * cols:(r + 1) * cols], cols)
+        return bits
+
+    def col_line(c):
+        if not 0 <= c < cols:
+            return -1
+        bits = col_bits[c]
+        if bits is None:
+            bits = col_bits[c] = _bits(cells[c::cols], rows)
+        return bits
+
+    def row_points(r, dc):
+        points = _forced(row_line(r - 1), row_line(r + 1), dc)
+        if r == end_row:
+            points |= 1 << end_col
+        (east if dc > 0 else west)[r] = points
+        return points
+
+    def col_points(c, dr):
+        points = _forced(col_line(c - 1), col_line(c + 1), dr)
+        if c == end_col:
+            points |= 1 << end_row
+        (south if dr > 0 else north)[c] = points
+        return points
+
+    def jump_vertical(r, c, dr):
+        # the row of the first jump point from (r, c) going dr, None at a wall
+        line = col_bits[c] or col_line(c)
+        if dr > 0:
+            points = south[c]
+            if points is None:
+                points = col_points(c, dr)
+            points >>= r + 1
+            if not points:
+                return None
+            walls = line >> r + 1
+            point = (points & -points).bit_length()
+            return r + point if point < (walls & -walls).bit_length() else None
+        points = north[c]
+        if points is None:
+            points = col_points(c, dr)
+        behind = (1 << r) - 1
+        point = (points & behind).bit_length() - 1
+        return point if point > (line & behind).bit_length() - 1 else None
+
+    def jump_horizontal(r, c, dc):
+        # the column of the first jump point from (r, c) going dc, None at a wall
+        line = row_bits[r] or row_line(r)
+        if dc > 0:
+            points = east[r]
+            if points is None:
+                points = row_points(r, dc)
+            points >>= c + 1
+            if not points:
+                return None
+            walls = line >> c + 1
+            point = (points & -points).bit_length()
+            return c + point if point < (walls & -walls).bit_length() else None
+        points = west[r]
+        if points is None:
+            points = row_points(r, dc)
+        behind = (1 << c) - 1
+        point = (points & behind).bit_length() - 1
+        return point if point > (line & behind).bit_length() - 1 else None
+
+    def jump_diagonal(r, c, dr, dc):
+        # how many diagonal steps from (r, c) to the first jump point, None at a wall
+        step = dr * cols + dc
+        cell = r * cols + c
+        steps = 0
+        while True:
+            r += dr
+            c += dc
+            cell += step
+            steps += 1
+            if not (0 <= r < rows and 0 <= c < cols) or cells[cell]:
+                return None
+            if r == end_row and c == end_col:
+                return steps
+            # a jump point if either straight component finds something
+            if jump_vertical(r, c, dr) is not None or jump_horizontal(r, c, dc) is not None:
+                return steps
+            # no corner cutting: the next diagonal step needs both sides free
+            if not (0 <= r + dr < rows and 0 <= c + dc < cols) or cells[cell + dr * cols] or cells[cell + dc]:
+                return None
+
+    def directions(r, c, parent):
+        # pruned set of directions to jump in from (r, c) reached from the cell id parent,
+        # the four straight neighbours are looked up once
+        cell = r * cols + c
+        down = r < rows - 1 and not cells[cell + cols]
+        up = r > 0 and not cells[cell - cols]
+        right = c < cols - 1 and not cells[cell + 1]
+        left = c > 0 and not cells[cell - 1]
+        if parent is None:
+            moves = [move for move, free in zip(STRAIGHT, (down, up, right, left)) if free]
+            for (dr, dc), free in zip(DIAGONAL, (down and right, down and left, up and right, up and left)):
+                if free and not cells[cell + dr * cols + dc]:
+                    moves.append((dr, dc))
+            return moves
+        pr, pc = divmod(parent, cols)
+        dr = (r > pr) - (r < pr)
+        dc = (c > pc) - (c < pc)
+        moves = []
+        if dr and dc:
+            ahead = down if dr > 0 else up
+            side = right if dc > 0 else left
+            if ahead:
+                moves.append((dr, 0))
+            if side:
+                moves.append((0, dc))
+            if ahead and side:
+                moves.append((dr, dc))
+        elif dr:
+            if down if dr > 0 else up:
+                moves.append((dr, 0))
+                if right:
+                    moves.append((dr, 1))
+                if left:
+                    moves.append((dr, -1))
+            if right:
+                moves.append((0, 1))
+            if left:
+                moves.append((0, -1))
+        else:
+            if right if dc > 0 else left:
+                moves.append((0, dc))
+                if down:
+                    moves.append((1, dc))
+                if up:
+                    moves.append((-1, dc))
+            if down:
+                moves.append((1, 0))
+            if up:
+                moves.append((-1, 0))
+        return moves
+
+    # the open list and the scores work on cell ids like search.py, positions are
+    # only made for the heuristic, visit and the path
+    source = start_row * cols + start_col
+    target = end_row * cols + end_col
+    pri_queue = []
+    count = 0
+    came_from = {}
+    g_score = {source: 0}
+    inf = float("inf")
+    start_h = heuristic(start, end)
+    pri_queue.append((start_h, start_h, count, source))
+    open_entry = {source: count}
+    expanded = 0
+    stale = 0
+
+    while pri_queue:
+        entry = heappop(pri_queue)
+        current = entry[3]
+        if open_entry.get(current) != entry[2]:
+            stale += 1
+            continue
+        del open_entry[current]
+        expanded += 1
+
+        if current == target:
+            # fill in the cells between the jump points
+            points = [end]
+            cell = target
+            while cell in came_from:
+                cell = came_from[cell]
+                points.append(divmod(cell, cols))
+            points.reverse()
+            path = [start]
+            for a, b in zip(points, points[1:]):
+                path.extend(_line(a, b))
+            return SearchResult(True, path, g_score[target] / COST_SCALE, expanded, count + 1, stale)
+
+        r, c = divmod(current, cols)
+        current_g = g_score[current]
+        for dr, dc in directions(r, c, came_from.get(current)):
+            # jump points are always on a straight or diagonal line from current
+            if dr and dc:
+                steps = jump_diagonal(r, c, dr, dc)
+                if steps is None:
+                    continue
+                point = (r + steps * dr, c + steps * dc)
+                temp_g_score = current_g + steps * DIAGONAL_COST
+            elif dr:
+                at = jump_vertical(r, c, dr)
+                if at is None:
+                    continue
+                point = (at, c)
+                temp_g_score = current_g + abs(at - r) * COST_SCALE
+            else:
+                at = jump_horizontal(r, c, dc)
+                if at is None:
+                    continue
+                point = (r, at)
+                temp_g_score = current_g + abs(at - c) * COST_SCALE
+            cell = point[0] * cols + point[1]
+            if temp_g_score < g_score.get(cell, inf):
+                came_from[cell] = current
+                g_score[cell] = temp_g_score
+                h_score = heuristic(point, end)
+                count += 1
+                heappush(pri_queue, (temp_g_score + h_score, h_score, count, cell))
+                open_entry[cell] = count
+                if visit:
+                    visit(point, OPEN)
+
+        if visit and current != source:
+            visit((r, c), CLOSED)
+
+    return SearchResult(False, [], inf, expanded, count + 1, stale)
@@ -0,0 +1,73 @@
+# per query limits for search / astar / dijkstra: pass limits=Limits(...) and the
+# search gives up when it runs out of expansions or time or gets cancelled, with
+# the best partial path it had (to the reached cell closest to the end by the
+# heuristic) instead of searching on. Without limits nothing is checked at all
+#
+#     token = CancelToken()
+#     result = astar(grid, start, end, limits=Limits(time_limit=0.005, cancel=token))
+#     # token.cancel() from a callback / another thread stops the search early
+#     if not result:
+#         result.status    # why it stopped, see below
+#         result.partial   # start -> closest cell so far
+import time
+
+# SearchResult.status
+FOUND = "found"
+NO_PATH = "no path"  # searched everything reachable
+UNREACHABLE = "unreachable"  # start and end are in different components, no search done
+OUT_OF_EXPANSIONS = "out of expansions"
+OUT_OF_TIME = "out of time"
+CANCELLED = "cancelled"
+
+# the clock and the cancel token are looked at every this many expansions
+EVERY = 256
+
+
+class CancelToken:
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def __bool__(self):
+        return self.cancelled
+
+
+class Limits:
+    # max_expansions and time_limit (seconds) count from the start of every search
+    # they are used for, deadline is an absolute time.perf_counter() value shared
+    # by all of them (a whole route, say)
+    def __init__(self, max_expansions=None, time_limit=None, deadline=None, cancel=None,
+                 every=EVERY, clock=time.perf_counter):
+        self.max_expansions = max_expansions
+        self.time_limit = time_limit
+        self.deadline = deadline
+        self.cancel = cancel
+        self.every = every
+        self.clock = clock
+        self.ends = None  # when the running search has to stop
+
+    def start(self):
+        # called by the search before it begins, returns the first expansion count to check at
+        ends = self.deadline
+        if self.time_limit is not None:
+            ends = self.clock() + self.time_limit if ends is None else min(ends, self.clock() + self.time_limit)
+        self.ends = ends
+        return 0  # look straight away: the token may be cancelled already
+
+    def next_check(self, expanded):
+        at = expanded + self.every
+        if self.max_expansions is not None:
+            at = min(at, self.max_expansions)
+        return at
+
+    def check(self, expanded):
+        # None to carry on, else the status to stop with
+        if self.cancel is not None and self.cancel.cancelled:
+            return CANCELLED
+        if self.max_expansions is not None and expanded >= self.max_expansions:
+            return OUT_OF_EXPANSIONS
+        if self.ends is not None and self.clock() >= self.ends:
+            return OUT_OF_TIME
+        return None
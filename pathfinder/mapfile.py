@@ -0,0 +1,119 @@
+# grids on disk
+#
+# .pfmap files are a 32 byte header followed by the occupancy of every cell, row major:
+#   magic b"PFMAP\0", format version, flags, rows, cols, padding
+# with PACKED set the cells are bit packed (8 per byte, first cell in the high bit,
+# like numpy.packbits) which is 8x smaller, without it there is one byte per cell,
+# exactly the layout of grid.cells. Raw files are memory mapped and used as
+# grid.cells as they are: nothing is read or copied up front, pages come in as
+# the search touches them and every process that opens the same file shares
+# them through the page cache. Packed files are mapped too but have to be
+# unpacked into a bytearray, one pass over the file
+#
+# read_ascii_map imports the ascii .map format of the usual grid benchmarks
+import mmap
+import struct
+
+from .grid import BARRIER, Grid
+
+MAGIC = b"PFMAP\0"
+VERSION = 1
+PACKED = 1
+HEADER = struct.Struct("<6sHIII12x")
+
+# one byte <-> 8 cells, built once
+_UNPACK = [bytes((byte >> shift) & 1 for shift in range(7, -1, -1)) for byte in range(256)]
+_PACK = {cells: byte for byte, cells in enumerate(_UNPACK)}
+# anything non zero is a barrier
+_ONES = bytes([0] + [BARRIER] * 255)
+
+# ascii .map: these are walkable, every other character is blocked
+# ('@' 'O' out of bounds, 'T' trees, 'W' water)
+ASCII_PASSABLE = ".GS"
+_ASCII = bytes(0 if chr(ch) in ASCII_PASSABLE else BARRIER for ch in range(256))
+
+
+def pack(cells):
+    cells = bytes(cells).translate(_ONES)
+    tail = -len(cells) % 8
+    if tail:
+        cells += bytes(tail)
+    lookup = _PACK.__getitem__
+    return bytes(lookup(cells[i:i + 8]) for i in range(0, len(cells), 8))
+
+
+def unpack(data, size):
+    # the first size cells of bit packed data, as a bytearray
+    cells = bytearray().join(_UNPACK[byte] for byte in data[:(size + 7) // 8])
+    del cells[size:]
+    return cells
+
+
+def save_map(grid, path, packed=True):
+    flags = PACKED if packed else 0
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, flags, grid.rows, grid.cols))
+        file.write(pack(grid.cells) if packed else bytes(grid.cells).translate(_ONES))
+
+
+def read_header(data):
+    if len(data) < HEADER.size:
+        raise ValueError("not a map file: too short")
+    magic, version, flags, rows, cols = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a map file: bad magic %r" % bytes(magic))
+    if version != VERSION:
+        raise ValueError("unsupported map file version %d" % version)
+    size = rows * cols
+    needed = (size + 7) // 8 if flags & PACKED else size
+    if len(data) - HEADER.size < needed:
+        raise ValueError("map file is truncated: %d cells need %d bytes" % (size, needed))
+    return flags, rows, cols
+
+
+def load_map(path, writable=False):
+    # edits to a loaded grid stay in this process (copy on write) unless writable,
+    # then edits to a raw file go straight back into the file
+    with open(path, "r+b" if writable else "rb") as file:
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_COPY
+        mapped = mmap.mmap(file.fileno(), 0, access=access)
+    flags, rows, cols = read_header(mapped)
+    data = memoryview(mapped)[HEADER.size:]
+    size = rows * cols
+    if flags & PACKED:
+        cells = unpack(data, size)
+        data.release()
+        mapped.close()
+    else:
+        # the mapping stays open for as long as the grid uses it
+        cells = data[:size]
+    return Grid(rows, cols, cells)
+
+
+def read_ascii_map(path):
+    with open(path) as file:
+        lines = file.read().splitlines()
+    header = {}
+    for index, line in enumerate(lines):
+        if line.strip() == "map":
+            break
+        key, _, value = line.partition(" ")
+        header[key] = value.strip()
+    else:
+        raise ValueError("%s: no 'map' line" % path)
+    try:
+        rows = int(header["height"])
+        cols = int(header["width"])
+    except (KeyError, ValueError):
+        raise ValueError("%s: needs height and width in the header" % path) from None
+    body = lines[index + 1:index + 1 + rows]
+    if len(body) < rows:
+        raise ValueError("%s: expected %d rows, got %d" % (path, rows, len(body)))
+    cells = bytearray()
+    for row, line in enumerate(body):
+        line = line.encode("latin-1")
+        if len(line) < cols:
+            raise ValueError("%s: row %d is %d wide, expected %d" % (path, row, len(line), cols))
+        cells += line[:cols].translate(_ASCII)
+    return Grid(rows, cols, cells)
+
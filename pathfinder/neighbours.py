@@ -0,0 +1,114 @@
+# neighbours are generated lazily from grid.cells when a node is expanded,
+# nothing is precomputed per cell. On a grid with terrain costs (grid.py) the step
+# costs are read from grid.costs at the same time, so a cost update is seen by the
+# next expansion without rebuilding anything
+from .heuristics import COST_SCALE, DIAGONAL_COST, chebyshev, manhattan, octile
+
+# down, up, right, left
+STRAIGHT = ((1, 0), (-1, 0), (0, 1), (0, -1))
+# diagnol right down, left down, right up, left up
+DIAGONAL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class Movement:
+    # how the agent may move and what each step costs, plus the heuristic that
+    # is exact for it on an empty grid
+    def __init__(self, name, moves, diagonal_cost, cut_corners, heuristic):
+        self.name = name
+        self.moves = moves
+        self.diagonal_cost = diagonal_cost
+        # can a diagonal squeeze between two barriers touching at a corner
+        self.cut_corners = cut_corners
+        self.heuristic = heuristic
+
+    def __repr__(self):
+        return "Movement(%r)" % self.name
+
+
+FOUR_WAY = Movement("4", STRAIGHT, None, False, manhattan)
+# sqrt(2) diagonals, a diagonal needs both cells it passes between to be free
+EIGHT_WAY = Movement("8", STRAIGHT + DIAGONAL, DIAGONAL_COST, False, octile)
+# diagonals cost one step and may cut corners, what astar.py used to do
+EIGHT_WAY_UNIFORM = Movement("8-uniform", STRAIGHT + DIAGONAL, COST_SCALE, True, chebyshev)
+
+MOVEMENTS = {m.name: m for m in (FOUR_WAY, EIGHT_WAY, EIGHT_WAY_UNIFORM)}
+
+_tables = {}
+
+
+def offset_table(cols, movement):
+    # (dr, dc, delta, cost) per move, delta is the change in cell id
+    # only depends on the grid width, so it is shared by every search on that width
+    key = (cols, movement)
+    table = _tables.get(key)
+    if table is None:
+        table = _tables[key] = tuple(
+            (dr, dc, dr * cols + dc, movement.diagonal_cost if dr and dc else COST_SCALE)
+            for dr, dc in movement.moves)
+    return table
+
+
+def expander(grid, movement):
+    # returns neighbours(cell) -> list of (neighbour id, step cost)
+    if grid.costs is not None:
+        return weighted_expander(grid, movement)
+    rows, cols, cells = grid.rows, grid.cols, grid.cells
+    table = offset_table(cols, movement)
+    cut_corners = movement.cut_corners
+    last_row, last_col = rows - 1, cols - 1
+
+    def neighbours(cell):
+        row, col = divmod(cell, cols)
+        # away from the edges no bounds checks are needed
+        interior = 0 < row < last_row and 0 < col < last_col
+        result = []
+        for dr, dc, delta, cost in table:
+            if not interior and not (0 <= row + dr <= last_row and 0 <= col + dc <= last_col):
+                continue
+            if cells[cell + delta]:
+                continue
+            if dr and dc and not cut_corners and (cells[cell + dr * cols] or cells[cell + dc]):
+                continue
+            result.append((cell + delta, cost))
+        return result
+
+    return neighbours
+
+
+def weighted_expander(grid, movement):
+    # expander() with terrain costs: length * (cost here + cost there) / 2, the
+    # lengths (COST_SCALE, DIAGONAL_COST) are even so that stays an integer
+    rows, cols, cells, costs = grid.rows, grid.cols, grid.cells, grid.costs
+    table = offset_table(cols, movement)
+    cut_corners = movement.cut_corners
+    last_row, last_col = rows - 1, cols - 1
+
+    def neighbours(cell):
+        row, col = divmod(cell, cols)
+        interior = 0 < row < last_row and 0 < col < last_col
+        here = costs[cell]
+        result = []
+        for dr, dc, delta, cost in table:
+            if not interior and not (0 <= row + dr <= last_row and 0 <= col + dc <= last_col):
+                continue
+            if cells[cell + delta]:
+                continue
+            if dr and dc and not cut_corners and (cells[cell + dr * cols] or cells[cell + dc]):
+                continue
+            result.append((cell + delta, cost * (here + costs[cell + delta]) >> 1))
+        return result
+
+    return neighbours
+
+
+def path_cost(grid, movement, path):
+    # what the engines would charge for a list of positions, in COST_SCALE units
+    costs, cols = grid.costs, grid.cols
+    diagonal = movement.diagonal_cost
+    total = 0
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        step = diagonal if r1 != r2 and c1 != c2 else COST_SCALE
+        if costs is not None:
+            step = step * (costs[r1 * cols + c1] + costs[r2 * cols + c2]) >> 1
+        total += step
+    return total
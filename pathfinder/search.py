@@ -0,0 +1,278 @@
+# search engines, pure functions over a Grid
+# positions are (row, col) tuples, cells are the integer ids of grid.py
+from heapq import heappop, heappush
+
+from .events import CLOSED, OPEN
+from .heuristics import COST_SCALE, scaled, zero
+from .limits import FOUND, NO_PATH, UNREACHABLE
+from .neighbours import EIGHT_WAY, FOUR_WAY, expander
+from .stats import STALE
+
+
+class SearchResult:
+    def __init__(self, found, path, cost, expanded, pushes=0, stale=0, status=None, partial=None):
+        self.found = found
+        self.path = path  # list of positions from start to end, [] if not found
+        # in steps, a diagonal counts as sqrt(2) under EIGHT_WAY, every step times its
+        # terrain cost on a grid with costs (grid.py)
+        self.cost = cost
+        self.expanded = expanded  # number of nodes taken off the open list and expanded
+        self.pushes = pushes  # heap pushes, including the start
+        self.stale = stale  # outdated heap entries popped and thrown away
+        # FOUND / NO_PATH, or why the search was cut short (limits.py)
+        self.status = status if status is not None else (FOUND if found else NO_PATH)
+        # cut short by limits: start -> the reached cell closest to the end
+        self.partial = partial if partial is not None else []
+
+    def __bool__(self):
+        return self.found
+
+    def __repr__(self):
+        return "SearchResult(found=%r, status=%r, cost=%r, expanded=%r, stale=%r, len(path)=%d)" % (
+            self.found, self.status, self.cost, self.expanded, self.stale, len(self.path))
+
+
+def reconstruct_path(came_from, current):
+    path = [current]
+    while current in came_from:
+        current = came_from[current]
+        path.append(current)
+    path.reverse()
+    return path
+
+
+def search(grid, start, end, heuristic=None, movement=EIGHT_WAY, visit=None, stats=None,
+           limits=None, components=None):
+    # start / end are (row, col), internally everything is an integer cell id
+    # g scores are integers in COST_SCALE units (see heuristics.py),
+    # the heuristic defaults to the one that matches the movement model, on a grid
+    # with terrain costs it is scaled by the cheapest one so it stays admissible
+    # visit(pos, state) is called with OPEN / CLOSED (events.py) as the search goes,
+    # the visualizer uses it to paint the spots
+    # stats=SearchStats() (stats.py) runs profiled_search instead, this loop stays as it is
+    # limits=Limits(...) (limits.py) caps expansions / time and can cancel, and with
+    # components=ComponentLabels(...) (components.py) ends in another region fail at once
+    if heuristic is None:
+        heuristic = movement.heuristic
+    heuristic = scaled(heuristic, grid.min_cost)
+    if components is not None and components.rejects(start, end, movement):
+        return SearchResult(False, [], float("inf"), 0, status=UNREACHABLE)
+    if stats is not None:
+        return profiled_search(grid, start, end, heuristic, movement, visit, stats, limits)
+    neighbours = expander(grid, movement)
+    pos = grid.pos
+    source = grid.cell_id(start)
+    target = grid.cell_id(end)
+
+    # open list is a plain binary heap of (f, h, count, cell) tuples:
+    # equal f goes to the lower h (closer to the end), then first come first served,
+    # so the expansion order is the same on every run
+    pri_queue = []
+    count = 0
+    came_from = {}
+
+    # only cells we reached get an entry, everything else is infinity
+    g_score = {source: 0}
+    inf = float("inf")
+    start_h = heuristic(start, end)
+    pri_queue.append((start_h, start_h, count, source))
+
+    # lazy deletion instead of decrease-key: when a cell gets a better g it is
+    # pushed again and open_entry remembers the count of its newest entry,
+    # any older entry for it is stale and gets skipped when popped
+    open_entry = {source: count}
+    expanded = 0
+    stale = 0
+    # expansion count at which to look at the limits next, never without limits
+    check_at = inf if limits is None else limits.start()
+
+    while pri_queue:
+        entry = heappop(pri_queue)
+        current = entry[3]
+        if open_entry.get(current) != entry[2]:
+            stale += 1
+            continue
+        if expanded >= check_at:
+            status = limits.check(expanded)
+            if status is not None:
+                return cut_short(grid, end, movement, g_score, came_from, status, expanded, count + 1, stale)
+            check_at = limits.next_check(expanded)
+        del open_entry[current]
+        expanded += 1
+
+        if current == target:
+            path = [pos(cell) for cell in reconstruct_path(came_from, target)]
+            return SearchResult(True, path, g_score[target] / COST_SCALE, expanded, count + 1, stale)
+
+        current_g = g_score[current]
+        for neighbour, cost in neighbours(current):
+            temp_g_score = current_g + cost
+
+            # if we found better way to reach the neighbour update the path
+            if temp_g_score < g_score.get(neighbour, inf):
+                came_from[neighbour] = current
+                g_score[neighbour] = temp_g_score
+                h_score = heuristic(pos(neighbour), end)
+                count += 1
+                heappush(pri_queue, (temp_g_score + h_score, h_score, count, neighbour))
+                open_entry[neighbour] = count
+                if visit:
+                    visit(pos(neighbour), OPEN)
+
+        if visit and current != source:
+            visit(pos(current), CLOSED)
+
+    return SearchResult(False, [], inf, expanded, count + 1, stale)
+
+
+def partial_path(grid, end, movement, g_score, came_from):
+    # start -> the reached cell the movement's heuristic puts closest to end (the
+    # cheaper one on a tie), for searches that had to stop before they got there
+    pos = grid.pos
+    distance = movement.heuristic
+    best = min(g_score, key=lambda cell: (distance(pos(cell), end), g_score[cell]))
+    return [pos(cell) for cell in reconstruct_path(came_from, best)]
+
+
+def cut_short(grid, end, movement, g_score, came_from, status, expanded, pushes, stale):
+    # the result of a search stopped by its limits
+    partial = partial_path(grid, end, movement, g_score, came_from)
+    return SearchResult(False, [], float("inf"), expanded, pushes, stale, status, partial)
+
+
+def profiled_search(grid, start, end, heuristic, movement, visit, stats, limits=None):
+    # search() with every step counted and timed into stats, same expansion order
+    stats.begin()
+    try:
+        return _profiled_search(grid, start, end, heuristic, movement, visit, stats, limits)
+    finally:
+        stats.end()
+
+
+def _profiled_search(grid, start, end, heuristic, movement, visit, stats, limits):
+    clock = stats.clock
+    trace = stats.trace
+    neighbours = expander(grid, movement)
+    pos = grid.pos
+    source = grid.cell_id(start)
+    target = grid.cell_id(end)
+
+    pri_queue = []
+    count = 0
+    came_from = {}
+    g_score = {source: 0}
+    inf = float("inf")
+    began = clock()
+    start_h = heuristic(start, end)
+    stats.heuristic_time += clock() - began
+    pri_queue.append((start_h, start_h, count, source))
+    stats.pushes += 1
+    stats.max_open = max(stats.max_open, 1)
+    open_entry = {source: count}
+    closed = set()
+    expanded = 0
+    stale = 0
+    check_at = inf if limits is None else limits.start()
+
+    while pri_queue:
+        began = clock()
+        entry = heappop(pri_queue)
+        stats.heap_time += clock() - began
+        stats.pops += 1
+        current = entry[3]
+        if open_entry.get(current) != entry[2]:
+            stale += 1
+            stats.stale += 1
+            if trace is not None:
+                trace.append([STALE, *pos(current)])
+            continue
+        if expanded >= check_at:
+            status = limits.check(expanded)
+            if status is not None:
+                return cut_short(grid, end, movement, g_score, came_from, status, expanded, count + 1, stale)
+            check_at = limits.next_check(expanded)
+        del open_entry[current]
+        expanded += 1
+        stats.expanded += 1
+        if current in closed:
+            stats.reopened += 1
+        closed.add(current)
+        current_g = g_score[current]
+
+        if current == target:
+            path = [pos(cell) for cell in reconstruct_path(came_from, target)]
+            return SearchResult(True, path, current_g / COST_SCALE, expanded, count + 1, stale)
+
+        began = clock()
+        steps = neighbours(current)
+        stats.neighbour_time += clock() - began
+        for neighbour, cost in steps:
+            temp_g_score = current_g + cost
+            if temp_g_score < g_score.get(neighbour, inf):
+                came_from[neighbour] = current
+                g_score[neighbour] = temp_g_score
+                began = clock()
+                h_score = heuristic(pos(neighbour), end)
+                stats.heuristic_time += clock() - began
+                count += 1
+                began = clock()
+                heappush(pri_queue, (temp_g_score + h_score, h_score, count, neighbour))
+                stats.heap_time += clock() - began
+                stats.pushes += 1
+                if len(pri_queue) > stats.max_open:
+                    stats.max_open = len(pri_queue)
+                open_entry[neighbour] = count
+                if trace is not None:
+                    trace.append([OPEN, *pos(neighbour), temp_g_score, h_score])
+                if visit:
+                    visit(pos(neighbour), OPEN)
+
+        if current != source:
+            # same place as the CLOSED visit, so a replayed trace paints the same
+            if trace is not None:
+                trace.append([CLOSED, *pos(current), current_g])
+            if visit:
+                visit(pos(current), CLOSED)
+
+    return SearchResult(False, [], inf, expanded, count + 1, stale)
+
+
+def distances(grid, source, targets=None, movement=FOUR_WAY):
+    # one dijkstra from source to many targets at once: {pos: cost} for every
+    # target it reached. Stops as soon as all targets are settled, with
+    # targets=None it settles everything reachable
+    neighbours = expander(grid, movement)
+    pos = grid.pos
+    start = grid.cell_id(source)
+    remaining = None if targets is None else {grid.cell_id(t) for t in targets}
+    g_score = {start: 0}
+    settled = {}
+    pri_queue = [(0, start)]
+    while pri_queue:
+        current_g, current = heappop(pri_queue)
+        if current in settled:
+            continue  # stale entry
+        settled[current] = current_g
+        if remaining is not None:
+            remaining.discard(current)
+            if not remaining:
+                break
+        for neighbour, cost in neighbours(current):
+            temp_g_score = current_g + cost
+            if neighbour not in settled and temp_g_score < g_score.get(neighbour, temp_g_score + 1):
+                g_score[neighbour] = temp_g_score
+                heappush(pri_queue, (temp_g_score, neighbour))
+    if targets is None:
+        return {pos(cell): g / COST_SCALE for cell, g in settled.items()}
+    return {t: settled[grid.cell_id(t)] / COST_SCALE for t in targets if grid.cell_id(t) in settled}
+
+
+def astar(grid, start, end, visit=None, movement=EIGHT_WAY, heuristic=None, stats=None,
+          limits=None, components=None):
+    # 8-connected with sqrt(2) diagonals and the octile heuristic by default
+    return search(grid, start, end, heuristic, movement, visit, stats, limits, components)
+
+
+def dijkstra(grid, start, end, visit=None, movement=FOUR_WAY, stats=None, limits=None, components=None):
+    # 4-connected by default, no heuristic (what dijkstra.py always did)
+    return search(grid, start, end, zero, movement, visit, stats, limits, components)
@@ -0,0 +1,98 @@
+# optional instrumentation for search / astar / dijkstra: pass stats=SearchStats()
+# and it gets filled in while the search runs. Without it the engines run their
+# plain loop, nothing is counted or timed
+#
+# counters add up over every search the same SearchStats is passed to (a route
+# passes it to every leg), in this process only: copies sent to pool workers
+# don't come back. The time split calls the clock around every neighbour
+# expansion, heuristic and heap operation, so a profiled search is a lot slower
+# than a plain one, compare the parts with each other rather than with plain runs
+import json
+import time
+import tracemalloc
+
+# trace events are lists in the order visit() gets them: [OPEN, row, col, g, h] for
+# a push, [CLOSED, row, col, g] for an expansion (states from events.py; like visit,
+# no OPEN for the start and no CLOSED for the start or the end) and [STALE, row, col]
+# for an outdated heap entry popped and skipped
+STALE = "stale"
+
+COUNTERS = ("searches", "expanded", "pushes", "pops", "stale", "reopened", "max_open")
+TIMERS = ("neighbour_time", "heuristic_time", "heap_time", "total_time")
+
+
+class SearchStats:
+    def __init__(self, trace=False, memory=False, clock=time.perf_counter):
+        self.clock = clock
+        self.searches = 0
+        self.expanded = 0  # cells taken off the open list and expanded
+        self.pushes = 0  # heap pushes, the start included
+        self.pops = 0  # heap pops, stale ones included
+        self.stale = 0  # popped entries that were outdated and skipped
+        self.reopened = 0  # expanded cells that got a better g later (inconsistent heuristics)
+        self.max_open = 0  # largest heap, stale entries included
+        self.neighbour_time = 0.0
+        self.heuristic_time = 0.0
+        self.heap_time = 0.0
+        self.total_time = 0.0
+        # tracemalloc peak while searching, in bytes (memory=True only, tracing is slow too)
+        self.memory = memory
+        self.peak_bytes = None
+        # with trace=True every open / closed / stale event with its g (and h for open)
+        self.trace = [] if trace else None
+        self.started = None
+        self.tracing = False
+
+    def __repr__(self):
+        return "SearchStats(%s)" % ", ".join("%s=%r" % item for item in self.as_dict().items())
+
+    def begin(self):
+        self.searches += 1
+        if self.memory:
+            self.tracing = not tracemalloc.is_tracing()
+            if self.tracing:
+                tracemalloc.start()
+            else:
+                tracemalloc.reset_peak()
+        self.started = self.clock()
+
+    def end(self):
+        self.total_time += self.clock() - self.started
+        if self.memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            self.peak_bytes = max(self.peak_bytes or 0, peak)
+            if self.tracing:
+                tracemalloc.stop()
+
+    def as_dict(self):
+        found = {name: getattr(self, name) for name in COUNTERS + TIMERS}
+        found["peak_bytes"] = self.peak_bytes
+        return found
+
+    def to_json(self, file, **details):
+        # file is a path or an open text file; details (grid size, start, end...)
+        # are stored next to the numbers and the trace
+        data = dict(details, stats=self.as_dict(), trace=self.trace)
+        if isinstance(file, str):
+            with open(file, "w") as out:
+                json.dump(data, out)
+        else:
+            json.dump(data, file)
+
+
+def load_trace(file):
+    # what to_json wrote, file is a path or an open text file
+    if isinstance(file, str):
+        with open(file) as source:
+            return json.load(source)
+    return json.load(file)
+
+
+def replay(trace, visit):
+    # feeds a recorded trace (SearchStats.trace or load_trace(...)["trace"]) to a
+    # visit(pos, state) callback in the order the search made it, an EventBatcher
+    # or the visualizer's painter can animate it again without searching
+    for event in trace:
+        if event[0] != STALE:
+            visit((event[1], event[2]), event[0])
+
@@ -0,0 +1,209 @@
+# shortest order to visit a set of stops (delivery style) instead of click order
+#   1. distance matrix: one multi-target dijkstra per stop
+#   2. visiting order: held-karp (exact) for small sets, nearest neighbour
+#      + 2-opt + or-opt for big ones
+#   3. the ordered stops go through route() for the actual path
+# the first stop is always where the tour starts, with closed=True it also ends there
+import time
+
+from . import batch
+from .heuristics import COST_SCALE
+from .neighbours import EIGHT_WAY
+from .search import astar, distances
+from .waypoints import route
+
+# held-karp is O(2^n * n^2), fine up to about this many stops
+EXACT_LIMIT = 12
+
+
+class TourResult:
+    def __init__(self, found, order, cost, route, timings):
+        self.found = found
+        self.order = order  # indices into the stops given, in visiting order
+        self.cost = cost
+        self.route = route  # RouteResult over the ordered stops (None if not found)
+        self.timings = timings  # seconds spent in "matrix", "order" and "route"
+
+    def __bool__(self):
+        return self.found
+
+    def __repr__(self):
+        return "TourResult(found=%r, cost=%r, order=%r)" % (self.found, self.cost, self.order)
+
+
+def _distances(source, targets, movement):
+    # inside a shared_pool worker
+    return distances(batch._worker_grid, source, targets, movement)
+
+
+def distance_matrix(grid, stops, movement=EIGHT_WAY, workers=None):
+    # integer costs in COST_SCALE units, None where there is no path
+    # grid distances are symmetric so stop i only needs to look for stops after it
+    n = len(stops)
+    matrix = [[0 if i == j else None for j in range(n)] for i in range(n)]
+    sources = range(n - 1)
+    if workers and workers > 1 and n > 2:
+        with batch.shared_pool(grid, workers) as pool:
+            rows = list(pool.map(_distances, stops[:-1], [stops[i + 1:] for i in sources],
+                                 [movement] * (n - 1)))
+    else:
+        rows = [distances(grid, stops[i], stops[i + 1:], movement) for i in sources]
+    for i, found in enumerate(rows):
+        for j in range(i + 1, n):
+            if stops[j] in found:
+                matrix[i][j] = matrix[j][i] = round(found[stops[j]] * COST_SCALE)
+    return matrix
+
+
+def path_cost(matrix, order):
+    return sum(matrix[a][b] for a, b in zip(order, order[1:]))
+
+
+def held_karp(matrix, closed=False):
+    # exact: best[mask][j] = cheapest way to leave 0, visit the stops in mask and end at j
+    n = len(matrix)
+    if n <= 2:
+        order = list(range(n))
+        return order + [0] if closed and n == 2 else order
+    inf = float("inf")
+    others = n - 1  # stop 0 is fixed, bit k stands for stop k + 1
+    full = (1 << others) - 1
+    best = [[inf] * others for _ in range(1 << others)]
+    parent = [[-1] * others for _ in range(1 << others)]
+    for k in range(others):
+        best[1 << k][k] = matrix[0][k + 1]
+    for mask in range(1, full + 1):
+        row = best[mask]
+        for j in range(others):
+            cost = row[j]
+            if cost == inf or not mask >> j & 1:
+                continue
+            dist = matrix[j + 1]
+            for k in range(others):
+                if mask >> k & 1:
+                    continue
+                step = dist[k + 1]
+                nxt = mask | 1 << k
+                if cost + step < best[nxt][k]:
+                    best[nxt][k] = cost + step
+                    parent[nxt][k] = j
+    last_row = best[full]
+    if closed:
+        last = min(range(others), key=lambda j: last_row[j] + matrix[j + 1][0])
+    else:
+        last = min(range(others), key=lambda j: last_row[j])
+    order = []
+    mask = full
+    while last != -1:
+        order.append(last + 1)
+        mask, last = mask & ~(1 << last), parent[mask][last]
+    order.append(0)
+    order.reverse()
+    return order + [0] if closed else order
+
+
+def nearest_neighbour(matrix, closed=False):
+    n = len(matrix)
+    order = [0]
+    left = set(range(1, n))
+    while left:
+        here = matrix[order[-1]]
+        nxt = min(left, key=lambda j: (here[j], j))
+        order.append(nxt)
+        left.remove(nxt)
+    return order + [0] if closed else order
+
+
+def two_opt(matrix, order):
+    # reverse order[i..j] while that makes the path shorter
+    # order[0] is fixed, the last stop is fixed too if it is the start again
+    order = list(order)
+    last = len(order) - 1 if order[-1] == order[0] and len(order) > 1 else len(order)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, last - 1):
+            a, b = order[i - 1], order[i]
+            for j in range(i + 1, last):
+                c = order[j]
+                before = matrix[a][b]
+                after = matrix[a][c]
+                if j + 1 < len(order):
+                    e = order[j + 1]
+                    before += matrix[c][e]
+                    after += matrix[b][e]
+                if after < before:
+                    order[i:j + 1] = order[i:j + 1][::-1]
+                    b = order[i]
+                    improved = True
+    return order
+
+
+def or_opt(matrix, order, longest=3):
+    # move runs of 1..longest stops (either way round) somewhere cheaper
+    order = list(order)
+    fixed_end = order[-1] == order[0] and len(order) > 1
+    improved = True
+    while improved:
+        improved = False
+        last = len(order) - 1 if fixed_end else len(order)
+        for size in range(1, longest + 1):
+            for i in range(1, last - size + 1):
+                seg = order[i:i + size]
+                s, e = seg[0], seg[-1]
+                p = order[i - 1]
+                n = order[i + size] if i + size < len(order) else None
+                gain = matrix[p][s] + (matrix[e][n] - matrix[p][n] if n is not None else 0)
+                rest = order[:i] + order[i + size:]
+                rest_last = len(rest) - 1 if fixed_end else len(rest)
+                best = None
+                for k in range(rest_last):
+                    if k == i - 1:
+                        continue  # that's where it came from
+                    a = rest[k]
+                    b = rest[k + 1] if k + 1 < len(rest) else None
+                    for first, second, flipped in ((s, e, False), (e, s, True)):
+                        add = matrix[a][first] + (matrix[second][b] - matrix[a][b] if b is not None else 0)
+                        if add < gain and (best is None or add < best[0]):
+                            best = (add, k, flipped)
+                if best is not None:
+                    _, k, flipped = best
+                    order = rest[:k + 1] + (seg[::-1] if flipped else seg) + rest[k + 1:]
+                    improved = True
+                    break
+            if improved:
+                break
+    return order
+
+
+def plan_tour(grid, stops, engine=astar, closed=False, exact_limit=EXACT_LIMIT, movement=EIGHT_WAY,
+              workers=None):
+    # stops[0] is where the tour starts, the rest are visited in the cheapest order found
+    # workers > 1 runs the matrix dijkstras and the route legs in a process pool
+    timings = {}
+    began = time.perf_counter()
+    matrix = distance_matrix(grid, stops, movement, workers)
+    timings["matrix"] = time.perf_counter() - began
+
+    if any(cost is None for cost in matrix[0]):
+        # some stop can't be reached from the start at all
+        timings["order"] = timings["route"] = 0.0
+        return TourResult(False, [], float("inf"), None, timings)
+
+    began = time.perf_counter()
+    if len(stops) <= exact_limit:
+        order = held_karp(matrix, closed)
+    else:
+        order = nearest_neighbour(matrix, closed)
+        # alternate until neither finds anything
+        while True:
+            cost = path_cost(matrix, order)
+            order = or_opt(matrix, two_opt(matrix, order))
+            if path_cost(matrix, order) >= cost:
+                break
+    timings["order"] = time.perf_counter() - began
+
+    began = time.perf_counter()
+    trip = route(grid, [stops[i] for i in order], engine, workers=workers, movement=movement)
+    timings["route"] = time.perf_counter() - began
+    return TourResult(bool(trip), order, trip.cost, trip, timings)
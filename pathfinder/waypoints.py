@@ -0,0 +1,68 @@
+# consecutive end points: start -> end -> end2 -> ... for any number of stops
+from .batch import run_query, shared_pool
+from .heuristics import COST_SCALE
+from .search import SearchResult, astar
+
+
+class RouteResult(SearchResult):
+    def __init__(self, found, path, cost, expanded, legs, pushes=0, stale=0, status=None):
+        super().__init__(found, path, cost, expanded, pushes, stale, status)
+        self.legs = legs  # one SearchResult per leg, in order
+
+    def __repr__(self):
+        return "RouteResult(found=%r, cost=%r, legs=%d, expanded=%r, len(path)=%d)" % (
+            self.found, self.cost, len(self.legs), self.expanded, len(self.path))
+
+    @property
+    def leg_costs(self):
+        return [leg.cost for leg in self.legs]
+
+
+def solve_legs(grid, pairs, engine=astar, visit=None, workers=None, **options):
+    # {(a, b): SearchResult} for every distinct pair, a leg that shows up twice
+    # (out and back over the same stops) is searched once
+    # legs don't depend on each other, with workers > 1 they run in a process pool
+    # (visit can't be called from other processes, so it needs workers=None)
+    unique = list(dict.fromkeys(pairs))
+    if workers and workers > 1 and len(unique) > 1:
+        if visit is not None:
+            raise ValueError("visit callbacks only work with workers=None")
+        # the grid goes to the workers through shared memory, see batch.py
+        with shared_pool(grid, min(workers, len(unique)), options) as pool:
+            legs = pool.map(run_query, [engine] * len(unique), *zip(*unique))
+            return dict(zip(unique, legs))
+
+    solved = {}
+    for a, b in unique:
+        leg = engine(grid, a, b, visit, **options)
+        solved[a, b] = leg
+        if not leg:
+            break  # the route can't be completed, no point doing the rest
+    return solved
+
+
+def route(grid, waypoints, engine=astar, visit=None, workers=None, **options):
+    # options (movement=..., heuristic=...) go to the engine for every leg
+    pairs = list(zip(waypoints, waypoints[1:]))
+    solved = solve_legs(grid, pairs, engine, visit, workers, **options)
+
+    legs = []
+    path = list(waypoints[:1])
+    cost = 0
+    expanded = pushes = stale = 0
+    for pair in pairs:
+        leg = solved.get(pair)
+        if leg is None:
+            break
+        legs.append(leg)
+        expanded += leg.expanded
+        pushes += leg.pushes
+        stale += leg.stale
+        if not leg:
+            # the first leg that failed says why
+            return RouteResult(False, [], float("inf"), expanded, legs, pushes, stale, leg.status)
+        # stitch, the joining point is shared by both legs
+        path.extend(leg.path[1:])
+        # leg costs are exact multiples of 1/COST_SCALE, add them up as integers
+        cost += round(leg.cost * COST_SCALE)
+    return RouteResult(True, path, cost / COST_SCALE, expanded, legs, pushes, stale)
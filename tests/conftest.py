@@ -0,0 +1,5 @@
+# the tests import the package straight from the checkout, like the benchmarks do
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,86 @@
+# what the engines are checked against: a plain dijkstra over (row, col) tuples,
+# no cell ids, no tables, no tricks, plus a few helpers for seeded random maps
+import random
+from heapq import heappop, heappush
+
+from pathfinder import COST_SCALE, EIGHT_WAY, EIGHT_WAY_UNIFORM, FOUR_WAY
+from pathfinder.generate import random_fill
+from pathfinder.neighbours import path_cost
+
+MOVEMENTS = (FOUR_WAY, EIGHT_WAY, EIGHT_WAY_UNIFORM)
+SEEDS = range(25)
+
+
+def reference(grid, start, end, movement=EIGHT_WAY):
+    # cost in COST_SCALE units, None without a path
+    if grid.is_barrier(start) or grid.is_barrier(end):
+        return None
+    dist = {start: 0}
+    pri_queue = [(0, start)]
+    while pri_queue:
+        d, here = heappop(pri_queue)
+        if d > dist[here]:
+            continue
+        if here == end:
+            return d
+        row, col = here
+        for dr, dc in movement.moves:
+            there = (row + dr, col + dc)
+            if not grid.in_bounds(there) or grid.is_barrier(there):
+                continue
+            if dr and dc and not movement.cut_corners and (
+                    grid.is_barrier((row + dr, col)) or grid.is_barrier((row, col + dc))):
+                continue
+            length = movement.diagonal_cost if dr and dc else COST_SCALE
+            step = length * (grid.cost(here) + grid.cost(there)) // 2
+            if d + step < dist.get(there, float("inf")):
+                dist[there] = d + step
+                heappush(pri_queue, (d + step, there))
+    return None
+
+
+def scaled(cost):
+    # an engine's cost back in COST_SCALE units
+    return None if cost == float("inf") else round(cost * COST_SCALE)
+
+
+def random_map(seed, weighted=False):
+    rnd = random.Random(seed)
+    size = rnd.randint(3, 16)
+    grid = random_fill(size, density=rnd.choice((0.1, 0.25, 0.4)), seed=seed)
+    if weighted:
+        grid.set_costs([rnd.randint(1, 9) for _ in range(size * size)])
+    return grid, rnd
+
+
+def free_cell(grid, rnd):
+    while True:
+        pos = (rnd.randrange(grid.rows), rnd.randrange(grid.cols))
+        if not grid.is_barrier(pos):
+            return pos
+
+
+def queries(grid, rnd, count=6):
+    if all(grid.cells):
+        return []
+    return [(free_cell(grid, rnd), free_cell(grid, rnd)) for _ in range(count)]
+
+
+def random_edit(grid, rnd, keep=()):
+    pos = (rnd.randrange(grid.rows), rnd.randrange(grid.cols))
+    if rnd.random() < 0.5 and pos not in keep:
+        grid.make_barrier(pos)
+    else:
+        grid.reset(pos)
+
+
+def check(result, want, grid=None, movement=EIGHT_WAY):
+    # result agrees with the reference cost want, and with a grid its path is a real
+    # path of that cost
+    if want is None:
+        assert not result.found
+        return
+    assert result.found
+    assert scaled(result.cost) == want
+    if grid is not None:
+        assert path_cost(grid, movement, result.path) == want
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from pathfinder import ARAStar, Grid, ara_star, weighted_astar
+from pathfinder.generate import random_fill
+from reference import MOVEMENTS, SEEDS, check, queries, random_map, reference, scaled
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_weighted_astar_stays_within_its_bound(seed):
+    grid, rnd = random_map(seed)
+    for start, end in queries(grid, rnd):
+        for movement in MOVEMENTS:
+            want = reference(grid, start, end, movement)
+            for weight in (1, 1.5, 3):
+                result = weighted_astar(grid, start, end, weight=weight, movement=movement)
+                assert result.found == (want is not None)
+                if want is not None:
+                    assert want <= scaled(result.cost) <= weight * want
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_ara_star_ends_optimal(seed):
+    grid, rnd = random_map(seed)
+    for start, end in queries(grid, rnd):
+        for movement in MOVEMENTS:
+            result = ara_star(grid, start, end, movement=movement)
+            check(result, reference(grid, start, end, movement), grid, movement)
+            assert result.bound == 1.0
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_every_bound_holds(seed):
+    grid, rnd = random_map(seed)
+    for start, end in queries(grid, rnd, 3):
+        want = reference(grid, start, end)
+        planner = ARAStar(grid, start, end, weight=4, step=0.5)
+        while True:
+            result = planner.improve(max_expansions=5)
+            if result.found:
+                assert want <= scaled(result.cost) <= result.bound * want + 1e-6
+            if planner.done:
+                break
+        check(result, want, grid)
+
+
+def test_refuses_a_step_that_never_gets_to_one():
+    for step in (0, -0.5):
+        with pytest.raises(ValueError):
+            ARAStar(Grid(4), (0, 0), (3, 3), step=step)
+
+
+def test_solutions_never_get_worse():
+    # a big weight taken off in small steps and small random budgets: a later round
+    # now and then finds a dearer path than an earlier one, that one must not be
+    # returned (seed 247 did, before)
+    for seed in range(300):
+        rnd = random.Random(seed)
+        grid = random_fill(rnd.randint(10, 40), density=rnd.choice((0.1, 0.2, 0.3)), seed=seed)
+        for start, end in queries(grid, rnd, 3):
+            planner = ARAStar(grid, start, end, weight=5, step=0.25)
+            costs, bounds = [], []
+            while not planner.done:
+                result = planner.improve(max_expansions=rnd.randint(1, 30))
+                if result.found:
+                    costs.append(result.cost)
+                    bounds.append(result.bound)
+            assert costs == sorted(costs, reverse=True) and bounds == sorted(bounds, reverse=True)
+            solutions = [cost for cost, *_ in planner.solutions]
+            assert solutions == sorted(solutions, reverse=True)
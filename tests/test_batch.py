@@ -0,0 +1,56 @@
+import pytest
+
+from pathfinder import FOUR_WAY, ComponentLabels, batch, dijkstra
+from reference import SEEDS, check, queries, random_map, reference
+
+
+@pytest.mark.parametrize("weighted", (False, True))
+def test_workers_see_the_same_grid(weighted):
+    grid, rnd = random_map(3, weighted)
+    pairs = queries(grid, rnd, 20)
+    pooled = dict(batch(grid, pairs, workers=2, chunksize=3))
+    assert sorted(pooled) == list(range(len(pairs)))
+    for i, (start, end) in enumerate(pairs):
+        check(pooled[i], reference(grid, start, end))
+
+
+def test_results_come_back_in_order_or_as_they_finish():
+    grid, rnd = random_map(SEEDS[5])
+    pairs = queries(grid, rnd, 10)
+    alone = list(batch(grid, iter(pairs), dijkstra, movement=FOUR_WAY))
+    ordered = list(batch(grid, pairs, dijkstra, workers=2, chunksize=4, movement=FOUR_WAY))
+    finished = sorted(batch(grid, pairs, dijkstra, workers=2, chunksize=4, ordered=False, movement=FOUR_WAY),
+                      key=lambda item: item[0])
+    costs = [result.cost for _, result in alone]
+    assert [i for i, _ in ordered] == list(range(len(pairs)))
+    assert [result.cost for _, result in ordered] == [result.cost for _, result in finished] == costs
+
+
+class Counted:
+    # counts how often it gets pickled in this process
+    pickled = 0
+
+    def __getstate__(self):
+        Counted.pickled += 1
+        return {}
+
+
+def tagged(grid, start, end, visit=None, tag=None):
+    return dijkstra(grid, start, end, visit)
+
+
+def test_options_go_to_each_worker_once():
+    grid, rnd = random_map(SEEDS[5])
+    pairs = queries(grid, rnd, 40)
+    Counted.pickled = 0
+    results = list(batch(grid, pairs, tagged, workers=2, chunksize=2, tag=Counted()))
+    assert len(results) == 40
+    assert Counted.pickled <= 2  # none with fork, once per worker with spawn
+
+
+def test_component_labels_work_in_the_workers():
+    grid, rnd = random_map(SEEDS[7])
+    pairs = queries(grid, rnd, 10)
+    labels = ComponentLabels(grid)
+    for i, result in batch(grid, pairs, workers=2, chunksize=3, components=labels):
+        check(result, reference(grid, *pairs[i]))
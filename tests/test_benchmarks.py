@@ -0,0 +1,27 @@
+# the benchmark scripts run as a user would run them, on tiny cases
+import csv
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(script, *args):
+    return subprocess.run([sys.executable, os.path.join(ROOT, "benchmarks", script), *args],
+                          capture_output=True, text=True, check=True).stdout
+
+
+def test_engines_benchmark_records_and_compares(tmp_path):
+    before, table = str(tmp_path / "before.json"), str(tmp_path / "run.csv")
+    small = ("--sizes", "12", "20", "--densities", "0.2", "--seeds", "2", "--repeat", "1")
+    run("engines.py", *small, "--json", before, "--csv", table)
+    with open(before) as file:
+        recorded = json.load(file)
+    assert len(recorded["results"]) == 3 * 2 * 1 * 2
+    assert {case["engine"] for case in recorded["results"]} == {"astar", "dijkstra", "variant"}
+    with open(table, newline="") as file:
+        assert len(list(csv.DictReader(file))) == len(recorded["results"])
+    compared = run("engines.py", *small, "--compare", before)
+    assert "astar" in compared and "variant" in compared
@@ -0,0 +1,22 @@
+import pytest
+
+from pathfinder import Grid, astar, bidirectional, bidirectional_astar, bidirectional_dijkstra
+from reference import MOVEMENTS, SEEDS, check, queries, random_map, reference
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_bidirectional_matches_the_reference(seed):
+    grid, rnd = random_map(seed)
+    for start, end in queries(grid, rnd):
+        for movement in MOVEMENTS:
+            want = reference(grid, start, end, movement)
+            check(bidirectional(grid, start, end, movement=movement), want, grid, movement)
+            check(bidirectional_astar(grid, start, end, movement=movement), want, grid, movement)
+            check(bidirectional_dijkstra(grid, start, end, movement=movement), want, grid, movement)
+
+
+def test_fewer_expansions_on_a_long_route():
+    grid = Grid.from_strings(["." * 40] + ["#" * 39 + "."] + ["." * 40] * 5)
+    one = astar(grid, (6, 0), (0, 0))
+    two = bidirectional_astar(grid, (6, 0), (0, 0))
+    assert two.cost == one.cost and two.expanded < one.expanded
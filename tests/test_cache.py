@@ -0,0 +1,48 @@
+import pytest
+
+from pathfinder import EIGHT_WAY, FOUR_WAY, Grid, PathCache, astar, bidirectional_astar, dijkstra, jps
+from reference import SEEDS, check, queries, random_edit, random_map, reference
+
+ENGINES = ((astar, {}), (dijkstra, {"movement": FOUR_WAY}), (jps, {}), (bidirectional_astar, {}))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_cached_answers_follow_barrier_edits(seed):
+    grid, rnd = random_map(seed)
+    cache = PathCache(grid)
+    # a few queries asked again and again, so answers do come from the cache
+    pairs = queries(grid, rnd, 4)
+    ends = {pos for pair in pairs for pos in pair}
+    for _ in range(40):
+        if rnd.random() < 0.4:
+            random_edit(grid, rnd, ends)
+        if not pairs:
+            break
+        start, end = rnd.choice(pairs)
+        engine, options = rnd.choice(ENGINES)
+        movement = options.get("movement", EIGHT_WAY)
+        check(cache.search(start, end, engine, **options), reference(grid, start, end, movement))
+    cache.close()
+
+
+def test_hits_pieces_and_invalidation():
+    grid = Grid(10)
+    cache = PathCache(grid)
+    whole = cache.search((0, 0), (9, 9))
+    assert cache.search((0, 0), (9, 9)) is whole and cache.hits == 1
+    piece = cache.search((2, 2), (7, 7))
+    assert cache.partial_hits == 1 and piece.cost == astar(grid, (2, 2), (7, 7)).cost
+    grid.make_barrier((0, 9))  # nowhere near the path
+    assert cache.search((0, 0), (9, 9)) is whole
+    grid.make_barrier((5, 5))  # on it
+    assert cache.search((0, 0), (9, 9)) is not whole and cache.invalidated >= 1
+    cache.close()
+
+
+def test_stays_under_its_byte_budget():
+    grid = Grid(30)
+    cache = PathCache(grid, max_bytes=20000)
+    for row in range(30):
+        cache.search((row, 0), (29 - row, 29))
+    assert 0 < len(cache) < 30 and cache.nbytes <= 20000
+    cache.close()
@@ -0,0 +1,40 @@
+import pytest
+
+from pathfinder import EIGHT_WAY_UNIFORM, FOUR_WAY, ComponentIndex, ComponentLabels, Grid
+from reference import SEEDS, queries, random_edit, random_map, reference
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_labels_agree_with_the_reference(seed):
+    grid, rnd = random_map(seed)
+    for diagonal, movement in ((False, FOUR_WAY), (True, EIGHT_WAY_UNIFORM)):
+        labels = ComponentLabels(grid, diagonal)
+        for start, end in queries(grid, rnd):
+            assert labels.connected(start, end) == (reference(grid, start, end, movement) is not None)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_index_follows_edits(seed):
+    grid, rnd = random_map(seed)
+    for diagonal, movement in ((False, FOUR_WAY), (True, EIGHT_WAY_UNIFORM)):
+        index = ComponentIndex(grid, diagonal)
+        for step in range(30):
+            random_edit(grid, rnd)
+            if step == 20:
+                grid.clear()
+            index.fresh()  # a split it couldn't settle is only relabelled at the next query
+            assert index.count == ComponentLabels(grid, diagonal).count
+            for start, end in queries(grid, rnd, 2):
+                assert index.connected(start, end) == (reference(grid, start, end, movement) is not None)
+        index.close()
+
+
+def test_most_edits_need_no_relabelling():
+    grid = Grid(60)
+    index = ComponentIndex(grid)
+    for col in range(0, 60, 3):
+        grid.make_barrier((30, col))  # a dotted line splits nothing
+    grid.make_barrier((10, 10))
+    grid.reset((10, 10))
+    assert index.connected((0, 0), (59, 59)) and index.rebuilds == 1
+    index.close()
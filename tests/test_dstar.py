@@ -0,0 +1,34 @@
+import pytest
+
+from pathfinder import FOUR_WAY, DStarLite, Grid
+from reference import MOVEMENTS, SEEDS, check, random_edit, random_map, reference
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_replans_match_the_reference_through_edits(seed):
+    grid, rnd = random_map(seed)
+    start, goal = (0, 0), (grid.rows - 1, grid.cols - 1)
+    grid.reset(start)
+    grid.reset(goal)
+    movement = MOVEMENTS[seed % len(MOVEMENTS)]
+    planner = DStarLite(grid, start, goal, movement)
+    for step in range(30):
+        for _ in range(rnd.randint(1, 3)):
+            random_edit(grid, rnd, (planner.start, goal))
+        if step == 20:
+            grid.clear()
+        result = planner.plan()
+        check(result, reference(grid, planner.start, goal, movement), grid, movement)
+        if result and len(result.path) > 1 and rnd.random() < 0.5:
+            planner.move_start(result.path[1])  # the agent takes a step
+    planner.close()
+
+
+def test_a_small_edit_does_less_work_than_the_first_plan():
+    grid = Grid(30)
+    planner = DStarLite(grid, (0, 0), (29, 29), FOUR_WAY)
+    first = planner.plan()
+    grid.make_barrier((29, 0))  # off the path
+    again = planner.plan()
+    assert again.cost == first.cost and again.expanded < first.expanded
+    planner.close()
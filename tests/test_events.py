@@ -0,0 +1,37 @@
+from pathfinder import CLOSED, OPEN, EventBatcher, Grid, astar
+
+
+def test_batches_every_so_many_expansions():
+    batches = []
+    batcher = EventBatcher(batches.append, every=3)
+    result = astar(Grid(12), (0, 0), (11, 11), batcher)
+    batcher.flush()
+    events = [event for batch in batches for event in batch]
+    closed = sum(1 for _, state in events if state == CLOSED)
+    assert closed == result.expanded - 2  # neither the start nor the end gets painted
+    assert {state for _, state in events} == {OPEN, CLOSED}
+    assert len(batches) == closed // 3 + (closed % 3 > 0)
+    assert batcher.batches == len(batches)
+
+
+def test_batches_by_time():
+    now = [0.0]
+    batches = []
+    batcher = EventBatcher(batches.append, fps=10, clock=lambda: now[0])
+    batcher((0, 0), OPEN)
+    batcher((0, 0), CLOSED)
+    assert batches == []
+    now[0] = 0.1
+    batcher((0, 1), CLOSED)
+    assert batches == [[((0, 0), OPEN), ((0, 0), CLOSED), ((0, 1), CLOSED)]]
+    batcher.flush()
+    assert len(batches) == 1  # nothing pending
+
+
+def test_everything_at_the_end_without_a_rate():
+    batches = []
+    batcher = EventBatcher(batches.append)
+    astar(Grid(8), (0, 0), (7, 7), batcher)
+    assert batches == []
+    batcher.flush()
+    assert len(batches) == 1
@@ -0,0 +1,28 @@
+import pytest
+
+from pathfinder.neighbours import path_cost
+from reference import MOVEMENTS, SEEDS, free_cell, random_map, reference, scaled
+
+fields = pytest.importorskip("pathfinder.fields")
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_fields_match_the_reference(seed):
+    grid, rnd = random_map(seed)
+    if all(grid.cells):
+        return
+    sources = list({free_cell(grid, rnd) for _ in range(2)})
+    for movement in MOVEMENTS:
+        field = fields.distance_field(grid, sources, movement)
+        for _ in range(12):
+            pos = (rnd.randrange(grid.rows), rnd.randrange(grid.cols))
+            found = [cost for cost in (reference(grid, pos, source, movement) for source in sources)
+                     if cost is not None]
+            if not found:
+                # barriers and cut off cells alike
+                assert field.cost(pos) == float("inf") and field.path(pos) == []
+                continue
+            assert scaled(field.cost(pos)) == min(found)
+            path = field.path(pos)
+            assert path[0] == pos and path[-1] in sources
+            assert path_cost(grid, movement, path) == min(found)
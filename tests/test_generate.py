@@ -0,0 +1,36 @@
+import pytest
+
+from pathfinder import ComponentLabels
+from pathfinder.generate import GENERATORS, random_fill
+
+# the mazes: every open cell reachable from every other one by exactly one route
+PERFECT = ("backtracker", "kruskal", "binary_tree", "sidewinder")
+
+
+@pytest.mark.parametrize("name", sorted(GENERATORS))
+def test_generators_are_seeded_and_sized(name):
+    make = GENERATORS[name]
+    assert make(31, seed=4).cells == make(31, seed=4).cells
+    assert make(31, seed=4).cells != make(31, seed=5).cells
+    for rows, cols in ((1, 1), (2, 2), (5, 5), (9, 20)):
+        grid = make(rows, cols, seed=1, keep=[(0, 0)])
+        assert (grid.rows, grid.cols, len(grid.cells)) == (rows, cols, rows * cols)
+        assert not grid.is_barrier((0, 0))
+
+
+@pytest.mark.parametrize("name", PERFECT)
+@pytest.mark.parametrize("seed", range(6))
+def test_mazes_are_perfect(name, seed):
+    grid = GENERATORS[name](21, 30, seed=seed)
+    free = [(r, c) for r in range(grid.rows) for c in range(grid.cols) if not grid.is_barrier((r, c))]
+    doors = sum(1 for r, c in free for there in ((r, c + 1), (r + 1, c))
+                if grid.in_bounds(there) and not grid.is_barrier(there))
+    # connected, and a tree: one door fewer than open cells
+    assert ComponentLabels(grid).count == 1 and doors == len(free) - 1
+
+
+def test_fill_density():
+    grid = random_fill(200, density=0.3, seed=1)
+    assert abs(sum(grid.cells) / len(grid.cells) - 0.3) < 0.01
+    assert not any(random_fill(50, density=0, seed=1).cells)
+    assert all(random_fill(50, density=1, seed=1).cells)
@@ -0,0 +1,45 @@
+import pickle
+
+import pytest
+
+from pathfinder import Grid
+
+
+def test_cell_ids_are_row_major():
+    grid = Grid(3, 5)
+    assert len(grid.cells) == len(grid) == 15
+    for cell in range(15):
+        assert grid.cell_id(grid.pos(cell)) == cell
+    assert grid.cell_id((2, 1)) == 11
+    assert grid.in_bounds((2, 4)) and not grid.in_bounds((3, 0)) and not grid.in_bounds((0, -1))
+
+
+def test_from_strings_and_from_array_agree():
+    lines = ["..#", "#..", "..."]
+    grid = Grid.from_strings(lines)
+    assert bytes(grid.cells) == bytes(Grid.from_array([[ch == "#" for ch in line] for line in lines]).cells)
+    assert grid.is_barrier((0, 2)) and grid.is_barrier((1, 0)) and not grid.is_barrier((2, 2))
+    with pytest.raises(ValueError):
+        Grid(3, 3, bytearray(8))
+
+
+def test_listeners_hear_real_edits_only():
+    grid = Grid(4)
+    heard = []
+    grid.subscribe(lambda pos, barrier: heard.append((pos, barrier)))
+    grid.make_barrier((1, 2))
+    grid.make_barrier((1, 2))  # already one, nothing changes
+    grid.reset((1, 2))
+    grid.reset((0, 0))
+    grid.clear()
+    assert heard == [((1, 2), True), ((1, 2), False), (None, False)]
+    assert grid.version == 3
+
+
+def test_copies_and_pickles_are_independent():
+    grid = Grid.from_strings([".#.", "...", "#.."])
+    grid.subscribe(lambda pos, barrier: None)
+    for other in (grid.copy(), pickle.loads(pickle.dumps(grid))):
+        assert bytes(other.cells) == bytes(grid.cells) and other.listeners == []
+        other.make_barrier((1, 1))
+        assert not grid.is_barrier((1, 1))
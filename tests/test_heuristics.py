@@ -0,0 +1,30 @@
+import random
+
+import pytest
+
+from pathfinder import EIGHT_WAY_UNIFORM, Grid, astar, euclidean
+from reference import MOVEMENTS, SEEDS, check, queries, random_map, reference
+
+
+@pytest.mark.parametrize("movement", MOVEMENTS, ids=repr)
+def test_each_heuristic_is_exact_on_an_empty_grid(movement):
+    grid = Grid(12)
+    rnd = random.Random(1)
+    for _ in range(30):
+        start = (rnd.randrange(12), rnd.randrange(12))
+        end = (rnd.randrange(12), rnd.randrange(12))
+        assert movement.heuristic(start, end) == reference(grid, start, end, movement)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_astar_is_optimal_under_every_movement(seed):
+    grid, rnd = random_map(seed)
+    for start, end in queries(grid, rnd):
+        for movement in MOVEMENTS:
+            want = reference(grid, start, end, movement)
+            if want is not None:
+                assert movement.heuristic(start, end) <= want
+            check(astar(grid, start, end, movement=movement), want, grid, movement)
+            if movement is not EIGHT_WAY_UNIFORM:
+                # admissible wherever a diagonal costs more than a straight step
+                check(astar(grid, start, end, movement=movement, heuristic=euclidean), want, grid, movement)
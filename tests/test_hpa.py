@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from pathfinder import EIGHT_WAY_UNIFORM, FOUR_WAY, Grid, HierarchicalGrid
+from pathfinder.generate import random_fill
+from pathfinder.neighbours import path_cost
+from reference import queries, random_edit, reference, scaled
+
+
+@pytest.mark.parametrize("movement", (FOUR_WAY, None), ids=("4", "8"))
+@pytest.mark.parametrize("seed", range(5))
+def test_finds_what_the_reference_finds_through_edits(seed, movement):
+    grid = random_fill(40, density=0.25, seed=seed)
+    rnd = random.Random(seed)
+    options = {} if movement is None else {"movement": movement}
+    hpa = HierarchicalGrid(grid, 8, **options)
+    movement = hpa.movement
+    for _ in range(10):
+        for _ in range(rnd.randint(1, 4)):
+            random_edit(grid, rnd)
+        for start, end in queries(grid, rnd, 3):
+            want = reference(grid, start, end, movement)
+            result = hpa.search(start, end)
+            assert result.found == (want is not None)
+            if want is not None:
+                # near optimal: never better than optimal, and a real path of its cost
+                assert scaled(result.cost) >= want
+                assert result.path[0] == start and result.path[-1] == end
+                assert path_cost(grid, movement, result.path) == scaled(result.cost)
+    hpa.close()
+
+
+def test_an_edit_rebuilds_only_its_cluster():
+    grid = Grid(64)
+    hpa = HierarchicalGrid(grid, 16)
+    grid.make_barrier((5, 5))  # inside the first cluster, its borders stay as they are
+    assert len(hpa.rebuild()) == 1
+    grid.make_barrier((15, 3))  # on a border: the clusters on both sides get relinked
+    assert len(hpa.rebuild()) == 2
+    result = hpa.search((0, 0), (63, 63))
+    assert result and scaled(result.cost) >= reference(grid, (0, 0), (63, 63))
+    hpa.close()
+
+
+def test_refuses_corner_cutting():
+    with pytest.raises(ValueError):
+        HierarchicalGrid(Grid(8), 4, EIGHT_WAY_UNIFORM)
@@ -0,0 +1,25 @@
+import pytest
+
+from pathfinder import FOUR_WAY, Grid, astar, jps
+from pathfinder.generate import random_fill
+from reference import SEEDS, check, queries, random_map, reference
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_jps_matches_the_reference(seed):
+    grid, rnd = random_map(seed)
+    for start, end in queries(grid, rnd):
+        check(jps(grid, start, end), reference(grid, start, end), grid)
+
+
+@pytest.mark.parametrize("density", (0.02, 0.15, 0.3))
+def test_jps_expands_fewer_cells_than_astar(density):
+    grid = random_fill(60, density=density, seed=1, keep=[(0, 0), (59, 59)])
+    plain = astar(grid, (0, 0), (59, 59))
+    jumped = jps(grid, (0, 0), (59, 59))
+    assert jumped.cost == plain.cost and jumped.expanded < plain.expanded
+
+
+def test_jps_refuses_other_movements():
+    with pytest.raises(ValueError):
+        jps(Grid(4), (0, 0), (3, 3), movement=FOUR_WAY)
@@ -0,0 +1,77 @@
+import pytest
+
+from pathfinder import CancelToken, ComponentLabels, Grid, Limits, PathCache, ara_star, astar, dijkstra, route
+from pathfinder.limits import CANCELLED, FOUND, NO_PATH, OUT_OF_EXPANSIONS, OUT_OF_TIME, UNREACHABLE
+from reference import SEEDS, queries, random_map, reference
+
+
+@pytest.mark.parametrize("profiled", (False, True))
+def test_limits_stop_early_with_a_partial_path(profiled):
+    from pathfinder import SearchStats
+    grid = Grid(60)
+    options = {"stats": SearchStats()} if profiled else {}
+    result = astar(grid, (0, 0), (59, 59), limits=Limits(max_expansions=10), **options)
+    assert result.status == OUT_OF_EXPANSIONS and result.expanded == 10 and not result
+    assert result.partial[0] == (0, 0) and len(result.partial) > 1
+    token = CancelToken()
+    token.cancel()
+    result = astar(grid, (0, 0), (59, 59), limits=Limits(cancel=token), **options)
+    assert result.status == CANCELLED and result.expanded == 0
+
+
+def test_time_runs_out_on_the_clock_given():
+    now = [0.0]
+
+    def clock():
+        now[0] += 1.0
+        return now[0]
+
+    result = dijkstra(Grid(60), (0, 0), (59, 59), limits=Limits(time_limit=10, every=1, clock=clock))
+    assert result.status == OUT_OF_TIME and 0 < result.expanded < 60 * 60
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_generous_limits_change_nothing(seed):
+    grid, rnd = random_map(seed)
+    labels = ComponentLabels(grid)
+    for start, end in queries(grid, rnd):
+        plain = astar(grid, start, end)
+        limited = astar(grid, start, end, limits=Limits(max_expansions=10 ** 6, time_limit=60),
+                        components=labels)
+        if plain:
+            assert (limited.status, limited.cost, limited.path) == (FOUND, plain.cost, plain.path)
+        else:
+            assert reference(grid, start, end) is None
+            assert limited.status in (NO_PATH, UNREACHABLE)
+
+
+def test_component_labels_reject_without_searching():
+    grid = Grid.from_strings(["..#..", "..#..", "..#.."])
+    labels = ComponentLabels(grid)
+    result = astar(grid, (0, 0), (0, 4), components=labels)
+    assert result.status == UNREACHABLE and result.expanded == 0
+    grid.reset((1, 2))
+    assert labels.connected((0, 0), (0, 4)) is None  # stale now, searches just search
+    assert astar(grid, (0, 0), (0, 4), components=labels).found
+
+
+def test_a_route_says_why_a_leg_stopped():
+    trip = route(Grid(30), [(0, 0), (29, 29), (0, 29)], limits=Limits(max_expansions=5))
+    assert not trip and trip.status == OUT_OF_EXPANSIONS
+
+
+def test_ara_star_out_of_budget_is_not_no_path():
+    grid = Grid(40)
+    result = ara_star(grid, (0, 0), (39, 39), max_expansions=3)
+    assert not result and result.status == OUT_OF_EXPANSIONS
+    assert result.partial[0] == (0, 0) and len(result.partial) > 1
+    assert ara_star(grid, (0, 0), (39, 39), time_limit=0).status == OUT_OF_TIME
+    walled = Grid.from_strings(["..#..", "..#..", "..#.."])
+    assert ara_star(walled, (0, 0), (0, 4)).status == NO_PATH
+    # so it isn't cached, and neither is a route over it
+    cache = PathCache(grid)
+    cache.search((0, 0), (39, 39), ara_star, max_expansions=3)
+    assert len(cache) == 0 and cache.search((0, 0), (39, 39), ara_star).found
+    cache.close()
+    trip = route(grid, [(0, 0), (39, 39)], ara_star, max_expansions=3)
+    assert trip.status == OUT_OF_EXPANSIONS
@@ -0,0 +1,34 @@
+import pytest
+
+from pathfinder import astar
+from pathfinder.generate import random_fill
+from pathfinder.mapfile import load_map, read_ascii_map, save_map
+
+
+@pytest.mark.parametrize("packed", (True, False))
+@pytest.mark.parametrize("rows, cols", ((37, 53), (1, 1), (8, 8), (3, 5)))
+def test_map_files_round_trip(tmp_path, packed, rows, cols):
+    grid = random_fill(rows, cols, density=0.3, seed=2)
+    path = str(tmp_path / "level.pfmap")
+    save_map(grid, path, packed)
+    loaded = load_map(path)
+    assert (loaded.rows, loaded.cols, bytes(loaded.cells)) == (rows, cols, bytes(grid.cells))
+
+
+def test_raw_maps_are_searched_in_place(tmp_path):
+    grid = random_fill(40, density=0.2, seed=3, keep=[(0, 0), (39, 39)])
+    path = str(tmp_path / "level.pfmap")
+    save_map(grid, path, packed=False)
+    loaded = load_map(path)
+    assert astar(loaded, (0, 0), (39, 39)).cost == astar(grid, (0, 0), (39, 39)).cost
+    writable = load_map(path, writable=True)
+    writable.make_barrier((0, 1))
+    assert load_map(path).is_barrier((0, 1))
+
+
+def test_reads_the_ascii_benchmark_format(tmp_path):
+    path = tmp_path / "arena.map"
+    path.write_text("type octile\nheight 3\nwidth 4\nmap\n..@.\n.T..\nW...\n")
+    grid = read_ascii_map(str(path))
+    assert (grid.rows, grid.cols) == (3, 4)
+    assert [grid.is_barrier(pos) for pos in ((0, 2), (1, 1), (2, 0), (0, 0))] == [True, True, True, False]
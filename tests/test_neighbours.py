@@ -0,0 +1,40 @@
+import pytest
+
+from pathfinder import COST_SCALE, EIGHT_WAY_UNIFORM
+from pathfinder.neighbours import expander
+from reference import MOVEMENTS, SEEDS, random_map
+
+
+def spelled_out(grid, movement, pos):
+    # the neighbours the way update_neighbours used to find them, one check at a time
+    row, col = pos
+    found = []
+    for dr, dc in movement.moves:
+        there = (row + dr, col + dc)
+        if not grid.in_bounds(there) or grid.is_barrier(there):
+            continue
+        if dr and dc and not movement.cut_corners and (
+                grid.is_barrier((row + dr, col)) or grid.is_barrier((row, col + dc))):
+            continue
+        length = movement.diagonal_cost if dr and dc else COST_SCALE
+        found.append((grid.cell_id(there), length * (grid.cost(pos) + grid.cost(there)) // 2))
+    return sorted(found)
+
+
+@pytest.mark.parametrize("weighted", (False, True))
+@pytest.mark.parametrize("seed", SEEDS)
+def test_lazy_neighbours_match_the_spelled_out_ones(seed, weighted):
+    grid, _ = random_map(seed, weighted)
+    for movement in MOVEMENTS:
+        neighbours = expander(grid, movement)
+        for cell in range(len(grid)):
+            assert sorted(neighbours(cell)) == spelled_out(grid, movement, grid.pos(cell))
+
+
+def test_neighbours_see_later_edits():
+    grid, _ = random_map(0)
+    grid.clear()
+    neighbours = expander(grid, EIGHT_WAY_UNIFORM)
+    assert len(neighbours(grid.cell_id((1, 1)))) == 8
+    grid.make_barrier((0, 0))
+    assert len(neighbours(grid.cell_id((1, 1)))) == 7
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from pathfinder import EIGHT_WAY, FOUR_WAY, Grid, astar, dijkstra
+from reference import SEEDS, check, queries, random_map, reference
+
+
+def test_the_package_needs_no_pygame():
+    code = "import sys, pathfinder; assert 'pygame' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True,
+                   cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_astar_and_dijkstra_match_the_reference(seed):
+    grid, rnd = random_map(seed)
+    for start, end in queries(grid, rnd):
+        check(astar(grid, start, end), reference(grid, start, end), grid)
+        check(dijkstra(grid, start, end), reference(grid, start, end, FOUR_WAY), grid, FOUR_WAY)
+
+
+def test_walled_off_end():
+    grid = Grid.from_strings(["..#..", "..#..", "..#.."])
+    result = astar(grid, (0, 0), (2, 4))
+    assert not result and result.path == [] and result.cost == float("inf")
+    assert astar(grid, (1, 1), (1, 1)).path == [(1, 1)]
+
+
+def test_ties_go_to_the_cell_closer_to_the_end():
+    # octile is exact on an empty grid, so every cell on a best path has the same f
+    # and the lower h decides: nothing off the path gets expanded
+    grid = Grid(30)
+    result = astar(grid, (2, 3), (25, 17))
+    assert result.expanded == len(result.path)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_expansion_order_is_the_same_every_run(seed):
+    grid, rnd = random_map(seed)
+    for start, end in queries(grid, rnd, 3):
+        runs = []
+        for _ in range(2):
+            order = []
+            astar(grid, start, end, lambda pos, state: order.append((pos, state)))
+            runs.append(order)
+        assert runs[0] == runs[1]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_improved_cells_are_requeued_not_lost(seed):
+    # without a heuristic on EIGHT_WAY cells often get a better g after being pushed:
+    # the old entry is skipped as stale and the cost still comes out optimal
+    grid, rnd = random_map(seed)
+    for start, end in queries(grid, rnd):
+        result = dijkstra(grid, start, end, movement=EIGHT_WAY)
+        check(result, reference(grid, start, end), grid)
+        assert result.pushes >= result.expanded + result.stale
+
+
+def test_stale_entries_are_counted():
+    stale = 0
+    for seed in SEEDS:
+        grid, rnd = random_map(seed)
+        stale += sum(astar(grid, start, end).stale for start, end in queries(grid, rnd))
+    assert stale > 0
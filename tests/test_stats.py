@@ -0,0 +1,42 @@
+import pytest
+
+from pathfinder import SearchStats, astar, dijkstra, route
+from pathfinder.stats import load_trace, replay
+from reference import SEEDS, queries, random_map
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_profiled_search_matches_the_plain_one(seed):
+    grid, rnd = random_map(seed)
+    for start, end in queries(grid, rnd):
+        for engine in (astar, dijkstra):
+            plain = engine(grid, start, end)
+            stats = SearchStats(trace=True)
+            profiled = engine(grid, start, end, stats=stats)
+            assert (profiled.found, profiled.cost, profiled.expanded, profiled.pushes, profiled.path) == (
+                plain.found, plain.cost, plain.expanded, plain.pushes, plain.path)
+            assert (stats.expanded, stats.stale, stats.searches) == (plain.expanded, plain.stale, 1)
+            assert stats.pops == plain.expanded + plain.stale
+
+
+def test_a_trace_replays_what_visit_saw(tmp_path):
+    grid, rnd = random_map(SEEDS[4])
+    start, end = queries(grid, rnd, 1)[0]
+    seen = []
+    stats = SearchStats(trace=True, memory=True)
+    astar(grid, start, end, lambda pos, state: seen.append((pos, state)), stats=stats)
+    assert stats.peak_bytes > 0
+    path = str(tmp_path / "trace.json")
+    stats.to_json(path, start=start, end=end)
+    replayed = []
+    replay(load_trace(path)["trace"], lambda pos, state: replayed.append((pos, state)))
+    assert replayed == seen
+
+
+def test_counters_add_up_over_a_route():
+    grid, rnd = random_map(SEEDS[2])
+    grid.clear()
+    stops = [(0, 0), (grid.rows - 1, 0), (0, grid.cols - 1)]
+    stats = SearchStats()
+    trip = route(grid, stops, stats=stats)
+    assert stats.searches == 2 and stats.expanded == trip.expanded
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from pathfinder import (
+    EIGHT_WAY, DStarLite, Grid, HierarchicalGrid, PathCache, ara_star, astar, bidirectional_astar,
+    dijkstra, distances, jps, weighted_astar)
+from reference import MOVEMENTS, SEEDS, check, queries, random_edit, random_map, reference, scaled
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_engines_match_the_reference_with_costs(seed):
+    grid, rnd = random_map(seed, weighted=True)
+    for start, end in queries(grid, rnd):
+        for movement in MOVEMENTS:
+            want = reference(grid, start, end, movement)
+            check(astar(grid, start, end, movement=movement), want, grid, movement)
+            check(dijkstra(grid, start, end, movement=movement), want, grid, movement)
+            check(bidirectional_astar(grid, start, end, movement=movement), want, grid, movement)
+            check(ara_star(grid, start, end, movement=movement), want, grid, movement)
+            assert scaled(distances(grid, start, [end], movement).get(end, float("inf"))) == want
+            bounded = weighted_astar(grid, start, end, weight=2, movement=movement)
+            assert bounded.found == (want is not None)
+            if want is not None:
+                assert want <= scaled(bounded.cost) <= 2 * want
+
+
+def cost_edit(grid, rnd):
+    top, left = rnd.randrange(grid.rows), rnd.randrange(grid.cols)
+    if rnd.random() < 0.5:
+        grid.set_cost((top, left), rnd.randint(1, 9))
+    else:
+        grid.fill_costs(rnd.randint(1, 5), (top, left, top + 2, left + 2))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_cache_and_dstar_follow_cost_edits(seed):
+    grid, rnd = random_map(seed)
+    start, goal = (0, 0), (grid.rows - 1, grid.cols - 1)
+    grid.reset(start)
+    grid.reset(goal)
+    cache = PathCache(grid)
+    planner = DStarLite(grid, start, goal)
+    for _ in range(30):
+        if rnd.random() < 0.3:
+            random_edit(grid, rnd, (start, goal))
+        else:
+            cost_edit(grid, rnd)  # the first one makes the layer
+        want = reference(grid, start, goal)
+        check(cache.search(start, goal), want, grid)
+        check(planner.plan(), want, grid)
+    cache.close()
+    planner.close()
+
+
+def test_cost_counts_track_the_layer():
+    rnd = random.Random(1)
+    grid = Grid(30)
+    for _ in range(200):
+        if rnd.random() < 0.7:
+            grid.set_cost((rnd.randrange(30), rnd.randrange(30)), rnd.randint(1, 40))
+        else:
+            top, left = rnd.randrange(-3, 30), rnd.randrange(-3, 30)
+            grid.fill_costs(rnd.randint(1, 40), (top, left, top + rnd.randint(0, 8), left + rnd.randint(0, 8)))
+        assert grid.min_cost == min(grid.costs)
+        assert grid.weighted == any(cost != 1 for cost in grid.costs)
+    grid.set_costs([7] * 900)
+    assert (grid.min_cost, grid.weighted) == (7, True)
+    grid.fill_costs(1)
+    assert (grid.min_cost, grid.weighted) == (1, False)
+
+
+def test_cost_edits_go_to_their_own_listeners():
+    grid = Grid(5)
+    boxes, barriers = [], []
+    grid.subscribe_costs(boxes.append)
+    grid.subscribe(lambda pos, barrier: barriers.append(pos))
+    grid.set_cost((1, 2), 4)
+    grid.fill_costs(3, (0, 0, 1, 1))
+    grid.fill_costs(2)
+    assert boxes == [(1, 2, 1, 2), (0, 0, 1, 1), None] and barriers == []
+    assert grid.cost_version == 3 and grid.version == 0
+    with pytest.raises(ValueError):
+        grid.set_costs([0] * 25)
+
+
+def test_engines_that_cannot_price_cells_refuse_a_weighted_grid():
+    grid = Grid(8)
+    grid.set_cost((3, 3), 5)
+    with pytest.raises(ValueError):
+        jps(grid, (0, 0), (7, 7))
+    with pytest.raises(ValueError):
+        HierarchicalGrid(grid, 4)
+    grid.set_cost((3, 3), 1)  # all plain ground again
+    assert jps(grid, (0, 0), (7, 7)).cost == astar(grid, (0, 0), (7, 7), movement=EIGHT_WAY).cost
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_distance_fields_price_the_terrain(seed):
+    fields = pytest.importorskip("pathfinder.fields")
+    grid, rnd = random_map(seed, weighted=True)
+    for source, end in queries(grid, rnd, 3):
+        field = fields.distance_field(grid, [source])
+        assert scaled(field.cost(end)) == reference(grid, end, source)
@@ -0,0 +1,63 @@
+import itertools
+
+import pytest
+
+from pathfinder import Grid, distances, plan_tour
+from pathfinder.tour import distance_matrix, held_karp, nearest_neighbour, or_opt, path_cost, two_opt
+from reference import MOVEMENTS, free_cell, random_map, reference, scaled
+
+
+def brute_force(matrix, closed):
+    # cheapest order over every permutation of the stops after the first
+    return min(path_cost(matrix, (0,) + rest + ((0,) if closed else ()))
+               for rest in itertools.permutations(range(1, len(matrix))))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_held_karp_against_every_order(seed):
+    grid, rnd = random_map(seed)
+    grid.clear()
+    stops = list(dict.fromkeys(free_cell(grid, rnd) for _ in range(7)))
+    matrix = distance_matrix(grid, stops)
+    for i, j in itertools.combinations(range(len(stops)), 2):
+        assert matrix[i][j] == matrix[j][i] == reference(grid, stops[i], stops[j])
+    for closed in (False, True):
+        order = held_karp(matrix, closed)
+        assert sorted(set(order)) == list(range(len(stops))) and order[0] == 0
+        assert path_cost(matrix, order) == brute_force(matrix, closed)
+        # the heuristics are never better than exact, and 2-opt / or-opt never make it worse
+        guess = nearest_neighbour(matrix, closed)
+        better = or_opt(matrix, two_opt(matrix, guess))
+        assert path_cost(matrix, order) <= path_cost(matrix, better) <= path_cost(matrix, guess)
+
+
+def test_plan_tour_uses_the_heuristics_past_the_exact_limit():
+    grid = Grid(12)
+    stops = [(0, 0)] + [(r, c) for r in (3, 8, 11) for c in (2, 6, 10)]
+    exact = plan_tour(grid, stops)
+    rough = plan_tour(grid, stops, exact_limit=4)
+    assert exact.found and rough.found
+    assert exact.cost <= rough.cost
+    assert sorted(rough.order) == list(range(len(stops)))
+    assert exact.route.path[0] == (0, 0)
+
+
+def test_an_unreachable_stop_fails_the_tour():
+    grid = Grid.from_strings(["..#..", "..#..", "..#.."])
+    assert not plan_tour(grid, [(0, 0), (2, 1), (0, 4)])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_distances_match_the_reference(seed):
+    grid, rnd = random_map(seed)
+    if all(grid.cells):
+        return
+    source = free_cell(grid, rnd)
+    targets = [free_cell(grid, rnd) for _ in range(5)]
+    for movement in MOVEMENTS:
+        found = distances(grid, source, targets, movement)
+        everything = distances(grid, source, movement=movement)
+        for target in targets:
+            want = reference(grid, source, target, movement)
+            assert scaled(found.get(target, float("inf"))) == want
+            assert scaled(everything.get(target, float("inf"))) == want
@@ -0,0 +1,35 @@
+# the pygame side, drawn off screen
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+import visualizer  # noqa: E402
+
+
+@pytest.fixture
+def window():
+    pygame.display.init()
+    yield pygame.display.set_mode((200, 200))
+    pygame.display.quit()
+
+
+def test_dirty_spots_only_redraws_match_a_full_redraw(window):
+    grid = visualizer.make_grid(20, 200)
+    board = visualizer.Board(window, grid, 200)
+    board.draw()
+    grid[3][4].make_barrier()
+    grid[5][5].make_open()
+    grid[6][5].make_closed()
+    grid[0][0].make_start()
+    board.draw()
+    grid[3][4].reset()
+    grid[9][9].make_barrier()
+    board.draw()
+    assert not board.dirty
+    frame = pygame.image.tostring(window, "RGB")
+    visualizer.Board(window, grid, 200).draw()
+    assert pygame.image.tostring(window, "RGB") == frame
+
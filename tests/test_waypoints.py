@@ -0,0 +1,33 @@
+import pytest
+
+from pathfinder import FOUR_WAY, Grid, dijkstra, route
+from reference import SEEDS, free_cell, random_map, reference, scaled
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_route_adds_up_its_legs(seed):
+    grid, rnd = random_map(seed)
+    if all(grid.cells):
+        return
+    stops = [free_cell(grid, rnd) for _ in range(4)]
+    trip = route(grid, stops)
+    legs = [reference(grid, a, b) for a, b in zip(stops, stops[1:])]
+    if None in legs:
+        assert not trip.found
+        return
+    assert [scaled(cost) for cost in trip.leg_costs] == legs
+    assert scaled(trip.cost) == sum(legs)
+    assert trip.path[0] == stops[0] and trip.path[-1] == stops[-1]
+    for stop in stops:
+        assert stop in trip.path
+
+
+def test_options_go_to_every_leg_and_workers_agree():
+    grid = Grid.from_strings(["....#...", ".##.#.#.", "......#.", "#.##...."])
+    stops = [(0, 0), (3, 7), (0, 7), (2, 0)]
+    alone = route(grid, stops, dijkstra, movement=FOUR_WAY)
+    pooled = route(grid, stops, dijkstra, workers=2, movement=FOUR_WAY)
+    assert alone.leg_costs == pooled.leg_costs
+    assert scaled(alone.cost) == sum(reference(grid, a, b, FOUR_WAY) for a, b in zip(stops, stops[1:]))
+    with pytest.raises(ValueError):
+        route(grid, stops, visit=lambda pos, state: None, workers=2)
@@ -0,0 +1,353 @@
+# pygame side of the visualizers, shared by astar.py, dijkstra.py and astar_variant.py
+# the actual searching lives in the headless pathfinder package
+import os
+import pygame
+import time
+
+from pathfinder import Grid, route
+from pathfinder.events import OPEN, EventBatcher
+from pathfinder.generate import GENERATORS
+from pathfinder.mapfile import load_map, save_map
+from pathfinder.stats import SearchStats
+
+# colors:
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+YELLOW = (255, 255, 0)
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+PURPLE = (128, 0, 128)
+ORANGE = (255, 165, 0)
+GREY = (128, 128, 128)
+TURQUOISE = (64, 224, 208)
+
+# how often the search animation is repainted: FPS frames a second,
+# or every EVERY expansions if that is set
+FPS = 60
+EVERY = None
+
+# print where the time went (pathfinder.stats.SearchStats) after every search,
+# searches skip the path cache while this is on
+PROFILE = False
+
+# what M draws, any name from pathfinder.generate.GENERATORS ("fill" is rows*rows/7
+# random barriers, there are also mazes, rooms and caves)
+MAZE = "fill"
+
+# where S saves the barriers and L loads them back from
+MAP_FILE = "grid.pfmap"
+
+
+# SPOT CLASS:
+
+
+class Spot:
+    # thin view over one cell of the headless Grid, only used for drawing
+    # the barriers live in grid.cells, the color is just what we paint
+    # every color change puts the spot in the shared dirty set so only it gets redrawn
+    __slots__ = ("grid", "row", "col", "color", "dirty")
+
+    def __init__(self, grid, row, col, dirty):
+        self.grid = grid
+        self.row = row #numbers
+        self.col = col
+        self.color = BLACK if grid.is_barrier((row, col)) else WHITE
+        self.dirty = dirty
+
+    def paint(self, color):
+        if color != self.color:
+            self.color = color
+            self.dirty.add(self)
+
+    def get_pos(self):
+        return self.row, self.col
+
+    def is_closed(self):
+        return self.color == RED  # already looked at the spot if its red
+
+    def is_open(self):
+        return self.color == GREEN  #spot updated neighbour yet to be looked
+
+    def is_barrier(self):  # obstacle/barrier
+        return self.grid.is_barrier((self.row, self.col))
+
+    def is_start(self):
+        return self.color == ORANGE  # start spot
+
+    def is_end(self):
+        return self.color == TURQUOISE  # end spot
+
+# these are to make the spots change color accordingly
+    def reset(self):
+        self.grid.reset((self.row, self.col))
+        self.paint(WHITE)
+
+    def make_start(self):
+        self.grid.reset((self.row, self.col))  # a target is never a barrier
+        self.paint(ORANGE)
+
+    def make_closed(self):
+        self.paint(RED)
+
+    def make_open(self):
+        self.paint(GREEN)
+
+    def make_barrier(self):
+        self.grid.make_barrier((self.row, self.col))
+        self.paint(BLACK)
+
+    def make_end(self):
+        self.grid.reset((self.row, self.col))  # a target is never a barrier
+        self.paint(TURQUOISE)
+
+    def make_path(self, color=PURPLE):
+        self.paint(color)
+
+    def draw(self, win, gap):
+        #position of the spot
+        pygame.draw.ellipse(win, self.color, (self.row * gap, self.col * gap, gap, gap))
+
+# END OF CLASS__________________________________________________________________________________
+
+
+def init_window(width, caption):
+    # square everything for display
+    win = pygame.display.set_mode((width, width))
+    pygame.display.set_caption(caption)
+    pygame.init()
+    return win
+
+
+def make_grid(rows, width):
+    grid = []
+    # 2d list (contains Spots (class)), all of them share one headless Grid
+    search_grid = Grid(rows)
+    dirty = set()
+    for i in range(rows):
+        grid.append([])
+        for j in range(rows):
+            spot = Spot(search_grid, i, j, dirty)
+            grid[i].append(spot)  # NOT Spot
+
+    return grid
+
+
+def to_grid(grid):
+    # the headless Grid the spots are a view of, search it directly
+    return grid[0][0].grid
+
+# drawing grid lines:
+def draw_grid(win, rows, width):
+    gap = width // rows
+    for i in range(rows):
+        pygame.draw.line(win, GREY, (0, i*gap), (width, i * gap))
+        pygame.draw.line(win, GREY, (i*gap, 0), (i*gap, width))
+
+
+class Board:
+    # what is on the screen. The grid lines and the barriers are kept on a cached
+    # background surface, a frame only restores and repaints the dirty spots
+    def __init__(self, win, grid, width):
+        self.win = win
+        self.grid = grid
+        self.rows = len(grid)
+        self.width = width
+        self.gap = width // self.rows
+        self.dirty = grid[0][0].dirty
+        self.background = None
+        # barriers as they are drawn on the background
+        self.drawn = None
+
+    def invalidate(self):
+        # next draw() repaints everything, e.g. after writing text over the board
+        self.background = None
+
+    def render_background(self):
+        self.background = pygame.Surface((self.width, self.width))
+        self.background.fill(GREY)
+        self.drawn = bytearray(to_grid(self.grid).cells)
+        for row in self.grid:
+            for spot in row:
+                color = BLACK if spot.is_barrier() else WHITE
+                pygame.draw.ellipse(self.background, color, self.rect(spot))
+        draw_grid(self.background, self.rows, self.width)
+
+    def rect(self, spot):
+        return pygame.Rect(spot.row * self.gap, spot.col * self.gap, self.gap, self.gap)
+
+    def draw_spot(self, spot):
+        if spot.color != WHITE and spot.color != BLACK:
+            rect = self.rect(spot)
+            spot.draw(self.win, self.gap)
+            # the two grid lines on this cell's top/left edge
+            pygame.draw.line(self.win, GREY, rect.topleft, rect.topright)
+            pygame.draw.line(self.win, GREY, rect.topleft, rect.bottomleft)
+
+    def draw(self):
+        if self.background is None:
+            self.render_background()
+            self.win.blit(self.background, (0, 0))
+            for row in self.grid:
+                for spot in row:
+                    self.draw_spot(spot)
+            self.dirty.clear()
+            pygame.display.update()
+            return
+        if not self.dirty:
+            return
+
+        cells = self.drawn
+        rows = self.rows
+        rects = []
+        for spot in self.dirty:
+            rect = self.rect(spot)
+            cell = spot.row * rows + spot.col
+            barrier = 1 if spot.is_barrier() else 0
+            if cells[cell] != barrier:
+                # barrier added or removed, fix the background under it
+                cells[cell] = barrier
+                self.background.fill(GREY, rect)
+                pygame.draw.ellipse(self.background, BLACK if barrier else WHITE, rect)
+                pygame.draw.line(self.background, GREY, rect.topleft, rect.topright)
+                pygame.draw.line(self.background, GREY, rect.topleft, rect.bottomleft)
+            self.win.blit(self.background, rect, rect)
+            self.draw_spot(spot)
+            rects.append(rect)
+        self.dirty.clear()
+        pygame.display.update(rects)
+
+
+def draw(win, grid, rows, width):
+    # repaints everything, Board.draw() is the cheap per frame version
+    Board(win, grid, width).draw()
+
+# TRANSLATES THE MOUSE POSITION INTO AN ACTUAL ROW AND COLOUMN CUBE THAT WE CLICKED
+
+
+def get_clicked_pos(pos, rows, width):
+    gap = width // rows  # width = width of the diplay screen
+    y, x = pos
+
+    row = y//gap    #row,col of our grid calculated
+    col = x//gap
+
+    return row, col
+
+
+def painter(board, every=EVERY, fps=FPS):
+    # visit callback for the engines: events are batched and each batch
+    # repaints only the cells it changed
+    grid = board.grid
+
+    def apply(events):
+        for event in pygame.event.get():
+            # if the quit cross option is pressed then we quit the pygame
+            if event.type == pygame.QUIT:
+                pygame.quit()
+
+        for (row, col), state in events:
+            spot = grid[row][col]
+            if spot.is_start() or spot.is_end():
+                continue  # keep the targets visible while searching
+            if state == OPEN:
+                spot.make_open()
+            else:
+                spot.make_closed()
+        board.draw()
+
+    return EventBatcher(apply, every, fps)
+
+
+def algorithm(board, start, end, engine, every=EVERY, fps=FPS, cache=None, stats=None):
+    # runs a headless engine and paints the spots while it goes
+    # with a PathCache an unchanged query just comes back (nothing to animate)
+    # stats=SearchStats() (or PROFILE) fills in counters and timings, see pathfinder/stats.py
+    visit = painter(board, every, fps)
+    if stats is None and PROFILE:
+        stats = SearchStats()
+    if stats is not None:
+        mission = engine(to_grid(board.grid), start.get_pos(), end.get_pos(), visit, stats=stats)
+    elif cache is not None:
+        mission = cache.search(start.get_pos(), end.get_pos(), engine, visit)
+    else:
+        mission = engine(to_grid(board.grid), start.get_pos(), end.get_pos(), visit)
+    visit.flush()
+    if PROFILE:
+        print(stats)
+    return mission
+
+
+def route_algorithm(board, spots, engine, every=EVERY, fps=FPS, stats=None):
+    # same for consecutive end points, spots are visited in order
+    visit = painter(board, every, fps)
+    waypoints = [spot.get_pos() for spot in spots]
+    if stats is None and PROFILE:
+        stats = SearchStats()
+    if stats is not None:
+        mission = route(to_grid(board.grid), waypoints, engine, visit, stats=stats)
+    else:
+        mission = route(to_grid(board.grid), waypoints, engine, visit)
+    visit.flush()
+    if PROFILE:
+        print(stats)
+    return mission
+
+
+def paint_path(board, path, color=PURPLE):
+    # path goes start -> end, paint it back from the end like it used to,
+    # one cell per frame
+    clock = pygame.time.Clock()
+    for row, col in reversed(path[1:-1]):
+        board.grid[row][col].make_path(color)
+        board.draw()
+        clock.tick(FPS)
+
+
+def make_maze(grid, rows, *keep):
+    #maze_generator: adds the barriers of a fresh MAZE map to what is there,
+    #the keep spots (start / end) are left alone
+    maze = GENERATORS[MAZE](rows)
+    for row in grid:
+        for spot in row:
+            if spot not in keep and maze.is_barrier(spot.get_pos()):
+                spot.make_barrier()
+
+
+def save_grid(grid, path=MAP_FILE):
+    save_map(to_grid(grid), path)
+
+
+def load_grid(grid, path=MAP_FILE, *keep):
+    # paints the saved barriers onto the spots, the keep spots (start / end) stay as they are
+    if not os.path.exists(path):
+        return False
+    saved = load_map(path)
+    if (saved.rows, saved.cols) != (len(grid), len(grid[0])):
+        return False
+    for row in grid:
+        for spot in row:
+            if spot in keep:
+                continue
+            if saved.is_barrier(spot.get_pos()):
+                spot.make_barrier()
+            elif spot.is_barrier():
+                spot.reset()
+    return True
+
+
+def show_result(board, mission):
+    win, width = board.win, board.width
+    batado = ''
+    if mission:
+        batado = 'MISSION SUCCESS!'
+    else:
+        batado = 'MISSION FAILURE!'
+    font = pygame.font.Font('freesansbold.ttf', 40)
+    text = font.render(batado, True, BLUE, GREEN)
+    text_rect = text.get_rect()
+    text_rect.center = (width//2, width//2)
+    win.blit(text, text_rect)
+    pygame.display.update()
+    time.sleep(3)
+    board.invalidate()  # clear the text on the next frame